@@ -0,0 +1,152 @@
+import numpy as np
+
+"""
+BatchSimulator Class: Plays many random Filler games at once using NumPy. Every game is stored as
+a layer of stacked bitboards, one unsigned 64 bit integer per board row (bit j is column j), for each
+color and each player's territory. All unfinished games are advanced one move per vectorized step, so
+the Python overhead is paid per move instead of per game. Boards can be at most 64 columns wide.
+Takes in the following parameters:
+    - boards: List of Boards to start the games from. They can be different positions but must all
+        have the same size and number of colors. Each board can appear more than once to play several games from it.
+    - rollout_policy: How both players choose their moves (see MCTS): "random", "epsilon_greedy" or
+        "softmax"
+    - rollout_epsilon: Probability of a random move with the "epsilon_greedy" policy
+    - rollout_temperature: Temperature of the "softmax" policy (in cells gained)
+"""
+class BatchSimulator:
+    def __init__(self, boards, rollout_policy = "random", rollout_epsilon = 0.1, rollout_temperature = 1.0):
+        if rollout_policy not in ["random", "epsilon_greedy", "softmax"]:
+            raise Exception(f"Invalid rollout policy {rollout_policy}")
+        self.rollout_policy = rollout_policy
+        self.rollout_epsilon = rollout_epsilon
+        self.rollout_temperature = rollout_temperature
+        self.size = boards[0].size
+        self.num_colors = boards[0].num_colors
+        self.board_size = self.size[0] * self.size[1]
+        self.num_games = len(boards)
+        if self.size[1] > 64:
+            raise Exception("Boards wider than 64 columns are not supported")
+        self.row_mask = np.uint64((1 << self.size[1]) - 1)
+
+        # Packing each row of cells into an integer. Uncaptured cells keep their original colors in
+        # the painted board data, and captured cells are never capturable again. Boards that appear 
+        # more than once are only packed once.
+        unique_boards = list({id(board): board for board in boards}.values())
+        board_index = {id(board): inx for inx, board in enumerate(unique_boards)}
+        games = np.array([board_index[id(board)] for board in boards])
+        data = np.stack([board.data for board in unique_boards])
+        self.color_masks = np.stack([self.pack(data == color)[games] for color in range(self.num_colors)])
+        self.player_1_territory = self.pack(np.stack([board.mask_to_cells(board.player_1_territory)
+                                                      for board in unique_boards]))[games]
+        self.player_2_territory = self.pack(np.stack([board.mask_to_cells(board.player_2_territory)
+                                                      for board in unique_boards]))[games]
+        self.player_1_color = np.array([board.player_1_color for board in unique_boards], dtype=np.intp)[games]
+        self.player_2_color = np.array([board.player_2_color for board in unique_boards], dtype=np.intp)[games]
+
+
+    # Packs stacked boolean boards of shape (games, rows, columns) into row bitboards (games, rows)
+    def pack(self, cells):
+        weights = np.left_shift(np.uint64(1), np.arange(self.size[1], dtype=np.uint64))
+        return np.bitwise_or.reduce(np.where(cells, weights, np.uint64(0)), axis=2)
+
+
+    # Returns the cells orthogonally adjacent to the given stacked row bitboards
+    def neighbors(self, masks):
+        neighbors = ((masks << np.uint64(1)) | (masks >> np.uint64(1))) & self.row_mask
+        neighbors[:, 1:] |= masks[:, :-1]
+        neighbors[:, :-1] |= masks[:, 1:]
+        return neighbors
+
+
+    # Chooses a uniformly random legal move in each of the given games
+    def random_moves(self, games):
+        # Giving illegal colors a negative random key so they are never the maximum
+        keys = np.random.random((len(games), self.num_colors))
+        keys[np.arange(len(games)), self.player_1_color[games]] = -1
+        keys[np.arange(len(games)), self.player_2_color[games]] = -1
+        return np.argmax(keys, axis=1)
+
+
+    # Returns the number of frontier cells of each color (the cells each color would capture next) for 
+    # a player in each of the given games, with shape (games, num_colors)
+    def frontier_counts(self, player_number, games):
+        territory = self.player_1_territory[games] if player_number == 1 else self.player_2_territory[games]
+        frontier = self.neighbors(territory) & ~(self.player_1_territory[games] | self.player_2_territory[games])
+        return np.bitwise_count(frontier[np.newaxis] & self.color_masks[:, games]).sum(axis=2, dtype=np.int64).T
+
+
+    # Chooses a legal move for a player in each of the given games with the rollout policy
+    def policy_moves(self, player_number, games):
+        if self.rollout_policy == "random":
+            return self.random_moves(games)
+        counts = self.frontier_counts(player_number, games)
+        if self.rollout_policy == "epsilon_greedy":
+            # Breaking ties between the best colors randomly, and replacing a rollout_epsilon share of 
+            # the moves with random ones
+            keys = counts + np.random.random(counts.shape)
+            explore = np.random.random(len(games)) < self.rollout_epsilon
+            keys[explore] = np.random.random((explore.sum(), self.num_colors))
+        else:
+            # Sampling from the softmax of the counts with the Gumbel-max trick
+            keys = counts / self.rollout_temperature - np.log(-np.log(np.random.random(counts.shape)))
+        keys[np.arange(len(games)), self.player_1_color[games]] = -np.inf
+        keys[np.arange(len(games)), self.player_2_color[games]] = -np.inf
+        return np.argmax(keys, axis=1)
+
+
+    # Plays the given moves for a player in the given games, capturing all connected cells of those colors
+    def update_boards(self, player_number, games, moves):
+        if player_number == 1:
+            territory, opponent_territory = self.player_1_territory[games], self.player_2_territory[games]
+            self.player_1_color[games] = moves
+        elif player_number == 2:
+            territory, opponent_territory = self.player_2_territory[games], self.player_1_territory[games]
+            self.player_2_color[games] = moves
+        else:
+            raise Exception("Invalid player number")
+
+        capturable = self.color_masks[moves, games] & ~(territory | opponent_territory)
+        gained = self.neighbors(territory) & capturable
+        while gained.any():
+            territory |= gained
+            capturable &= ~gained
+            gained = self.neighbors(gained) & capturable
+
+        if player_number == 1:
+            self.player_1_territory[games] = territory
+        else:
+            self.player_2_territory[games] = territory
+
+
+    # Returns the scores of both players in every game
+    def get_scores(self):
+        return (np.bitwise_count(self.player_1_territory).sum(axis=1, dtype=np.int64),
+                np.bitwise_count(self.player_2_territory).sum(axis=1, dtype=np.int64))
+
+
+    # Plays out every game with the rollout policy, starting with first_player, and returns arrays of the
+    # win/loss results and the estimated final score (as a fraction of the board) for the given player.
+    # A game stops as soon as one player holds more than half the board, since the winner can't change 
+    # after that, and its uncaptured cells are split between the players in proportion to their territories.
+    def simulate(self, player_number, first_player):
+        second_player = 1 if first_player == 2 else 2
+        games = np.arange(self.num_games)
+        self.num_moves = 0 # Moves played in all the games, for profiling
+
+        # Playing out the simulations, dropping each game from the batch once it is decided
+        while len(games) > 0:
+            player_1_score = np.bitwise_count(self.player_1_territory[games]).sum(axis=1, dtype=np.int64)
+            player_2_score = np.bitwise_count(self.player_2_territory[games]).sum(axis=1, dtype=np.int64)
+            games = games[(player_1_score + player_2_score < self.board_size) & 
+                          (2 * np.maximum(player_1_score, player_2_score) <= self.board_size)]
+            if len(games) > 0:
+                self.update_boards(first_player, games, self.policy_moves(first_player, games))
+                self.update_boards(second_player, games, self.policy_moves(second_player, games))
+                self.num_moves += 2 * len(games)
+
+        # Returning the results
+        scores = self.get_scores()
+        if player_number == 1:
+            return ((scores[0] > scores[1]).astype(int), scores[0] / (scores[0] + scores[1]))
+        else:
+            return ((scores[1] > scores[0]).astype(int), scores[1] / (scores[0] + scores[1]))
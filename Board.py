@@ -3,6 +3,22 @@ import matplotlib.pyplot as plt
 from matplotlib import colors
 import random
 
+
+# Zobrist keys shared by every board of the same size and number of colors: a key per cell for each 
+# player, and a key per color for each player. Generated from a fixed seed so equal positions always
+# hash equally.
+zobrist_keys = {}
+
+def get_zobrist_keys(size, num_colors = 6):
+    if (size, num_colors) not in zobrist_keys:
+        generator = random.Random(f"zobrist {size[0]}x{size[1]}")
+        num_bits = size[0] * (size[1] + 1)
+        zobrist_keys[size, num_colors] = ([generator.getrandbits(64) for _ in range(num_bits)],
+                                          [generator.getrandbits(64) for _ in range(num_bits)],
+                                          [[generator.getrandbits(64) for _ in range(num_colors)] for _ in range(2)])
+    return zobrist_keys[size, num_colors]
+
+
 class Board:  
     """
         Creates a random Filler board using random integer intialziation. Then fixes the board 
@@ -10,28 +26,217 @@ class Board:
         Optional inputs:
             - size: Tuple determining the board size
             - data: Numpy array of integers supplying the data for a specific board configuration
+            - num_colors: Number of colors (at least 5, so a cell can always differ from its four
+              neighbors). A board given by data gets as many colors as its data uses if that is more.
+              MCTS searches boards with at most 128 colors and GameRecords stores at most 15.
     """
-    def __init__(self, size = (7,8), data = None):
+    def __init__(self, size = (7,8), data = None, num_colors = 6):
+        if num_colors < 5:
+            raise Exception("Boards need at least 5 colors")
         if data is not None:
             self.size = data.shape
             self.data = data
+            self.num_colors = max(num_colors, int(data.max()) + 1)
         else:
             self.size = size
-            self.data = np.random.randint(0, high=6, size=self.size)
+            self.num_colors = num_colors
+            self.data = np.random.randint(0, high=self.num_colors, size=self.size)
             self.fix_board()
         
         self.player_1_color = self.data[self.size[0]-1,0]
         self.player_2_color = self.data[0,self.size[1]-1]
         
-        self.player_1_cells_captured = {(self.size[0]-1,0)}
-        self.player_2_cells_captured = {(0,self.size[1]-1)}
+        self.init_bitboards()
+        self.player_1_territory = self.cell_mask(self.size[0]-1,0)
+        self.player_2_territory = self.cell_mask(0,self.size[1]-1)
+        self.init_frontiers()
+        self.init_zobrist_hash()
+        self.undo_log = []
+
+
+    # The board colors with each territory painted in its player's color. Territories are only
+    # repainted when the data is read (e.g. for display) instead of on every move. Uncaptured cells
+    # are repainted too since pop_move can give cells back.
+    @property
+    def data(self):
+        if self.repaint_needed:
+            uncaptured = self.full_mask & ~(self.player_1_territory | self.player_2_territory)
+            for color, mask in enumerate(self.color_masks):
+                self._data[self.mask_to_cells(mask & uncaptured)] = color
+            self._data[self.mask_to_cells(self.player_1_territory)] = self.player_1_color
+            self._data[self.mask_to_cells(self.player_2_territory)] = self.player_2_color
+            self.repaint_needed = False
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self.repaint_needed = False
+
+
+    # Restores boards pickled before territories were stored as bitboards (e.g. GUI save files)
+    # or before frontiers were tracked or the number of colors could change
+    def __setstate__(self, state):
+        player_1_cells = state.pop('player_1_cells_captured', None)
+        player_2_cells = state.pop('player_2_cells_captured', None)
+        if 'data' in state:
+            state['_data'] = state.pop('data')
+            state['repaint_needed'] = False
+        self.__dict__.update(state)
+        if 'num_colors' not in state:
+            self.num_colors = 6
+        if player_1_cells is not None:
+            self.init_bitboards()
+            self.player_1_territory = sum(self.cell_mask(*cell) for cell in player_1_cells)
+            self.player_2_territory = sum(self.cell_mask(*cell) for cell in player_2_cells)
+            
+            # Captured cells were painted over, so their original colors are unknown. They can
+            # never be captured again so it is enough to remove them from the color masks.
+            captured = self.player_1_territory | self.player_2_territory
+            self.color_masks = [mask & ~captured for mask in self.color_masks]
+        if 'player_1_frontier' not in state:
+            self.init_frontiers()
+        if 'zobrist_hash' not in state:
+            self.init_zobrist_hash()
+        if 'undo_log' not in state:
+            self.undo_log = []
+
+
+    # Builds the bitboards for the board's colors. Cell (i,j) is bit i*(columns+1)+j, where the extra 
+    # (always empty) column on each row keeps left/right shifts from wrapping onto the next row.
+    def init_bitboards(self):
+        self.stride = self.size[1] + 1
+        self.full_mask = self.cells_to_mask(np.ones(self.size, dtype=bool))
+        self.color_masks = [self.cells_to_mask(self.data == color) for color in range(self.num_colors)]
+
+
+    # Finds each player's frontier (the uncaptured cells bordering their territory) and the number of
+    # frontier cells of each color. These are then kept up to date incrementally by update_board.
+    def init_frontiers(self):
+        uncaptured = self.full_mask & ~(self.player_1_territory | self.player_2_territory)
+        self.player_1_frontier = self.neighbors_mask(self.player_1_territory) & uncaptured
+        self.player_2_frontier = self.neighbors_mask(self.player_2_territory) & uncaptured
+        self.player_1_frontier_counts = [(self.player_1_frontier & mask).bit_count() for mask in self.color_masks]
+        self.player_2_frontier_counts = [(self.player_2_frontier & mask).bit_count() for mask in self.color_masks]
+
+
+    # Computes the Zobrist hash of the position (both territories and both player colors) from scratch.
+    # It is then kept up to date incrementally by update_board.
+    def init_zobrist_hash(self):
+        color_keys = get_zobrist_keys(self.size, self.num_colors)[2]
+        self.zobrist_hash = (self.zobrist_cells(1, self.player_1_territory) ^ self.zobrist_cells(2, self.player_2_territory) 
+                             ^ color_keys[0][self.player_1_color] ^ color_keys[1][self.player_2_color])
+
+
+    # XOR of a player's Zobrist keys for the cells of a bitboard
+    def zobrist_cells(self, player_number, mask):
+        cell_keys = get_zobrist_keys(self.size, self.num_colors)[player_number - 1]
+        key = 0
+        while mask:
+            lowest_cell = mask & -mask
+            key ^= cell_keys[lowest_cell.bit_length() - 1]
+            mask ^= lowest_cell
+        return key
+
+
+    # Returns the Zobrist hash of the position after the given move without making the move
+    def hash_after(self, player_number, color_value):
+        if player_number == 1:
+            territory, opponent_territory, current_color = (self.player_1_territory, self.player_2_territory, 
+                                                            self.player_1_color)
+        elif player_number == 2:
+            territory, opponent_territory, current_color = (self.player_2_territory, self.player_1_territory, 
+                                                            self.player_2_color)
+        else:
+               raise Exception("Invalid player number")
+        
+        gained = self.capture(territory, opponent_territory, color_value) & ~territory
+        color_keys = get_zobrist_keys(self.size, self.num_colors)[2][player_number - 1]
+        return (self.zobrist_hash ^ self.zobrist_cells(player_number, gained) 
+                ^ color_keys[current_color] ^ color_keys[color_value])
+
+
+    # Bit for a single cell of the board
+    def cell_mask(self, row, column):
+        return 1 << (row * self.stride + column)
+
+
+    # Adds the empty guard column to a boolean array of cells and flattens it in bit order
+    def pad_cells(self, cells):
+        padded = np.zeros((self.size[0], self.stride), dtype=bool)
+        padded[:, :self.size[1]] = cells
+        return padded.ravel()
+
+
+    # Converts a boolean array of cells into a bitboard
+    def cells_to_mask(self, cells):
+        return int.from_bytes(np.packbits(self.pad_cells(cells), bitorder='little').tobytes(), 'little')
+
+
+    # Converts a bitboard back into a boolean array of cells
+    def mask_to_cells(self, mask):
+        num_bits = self.size[0] * self.stride
+        mask_bytes = np.frombuffer(mask.to_bytes((num_bits + 7) // 8, 'little'), dtype=np.uint8)
+        bits = np.unpackbits(mask_bytes, count=num_bits, bitorder='little').astype(bool)
+        return bits.reshape(self.size[0], self.stride)[:, :self.size[1]]
+
+
+    # Converts a bitboard into a set of (row, column) tuples
+    def mask_to_set(self, mask):
+        return {(int(row), int(column)) for row, column in zip(*np.nonzero(self.mask_to_cells(mask)))}
+
+
+    # Captured cells as sets of (row, column) tuples, for code that still expects the original
+    # representation. The bitboards player_1_territory and player_2_territory are the real state.
+    @property
+    def player_1_cells_captured(self):
+        return self.mask_to_set(self.player_1_territory)
+
+    @property
+    def player_2_cells_captured(self):
+        return self.mask_to_set(self.player_2_territory)
+
+
+    # Returns the cells orthogonally adjacent to the given bitboard (not including the bitboard itself
+    # unless two of its cells are adjacent)
+    def neighbors_mask(self, mask):
+        return ((mask << 1) | (mask >> 1) | (mask << self.stride) | (mask >> self.stride)) & self.full_mask
+
+
+    # Returns a territory grown by capturing every uncaptured cell of color_value connected to it.
+    # Flood fills, so this also handles boards (e.g. from real games) with touching same-colored cells.
+    def capture(self, territory, opponent_territory, color_value):
+        capturable = self.color_masks[color_value] & ~(territory | opponent_territory)
+        gained = self.neighbors_mask(territory) & capturable
+        while gained:
+            territory |= gained
+            capturable &= ~gained
+            gained = self.neighbors_mask(gained) & capturable
+        return territory
+
+
+    # Returns a player's frontier after the player captured the gained cells (all of color_value), 
+    # updating the frontier's color counts in place. Only the neighbors of the gained cells are new.
+    def grow_frontier(self, frontier, frontier_counts, gained, color_value):
+        new_frontier = (frontier | self.neighbors_mask(gained)) & ~(
+            self.player_1_territory | self.player_2_territory)
+        added = new_frontier & ~frontier
+        
+        # Every frontier cell of color_value was just captured
+        frontier_counts[color_value] = 0
+        for color, mask in enumerate(self.color_masks):
+            if added & mask:
+                frontier_counts[color] += (added & mask).bit_count()
+        return new_frontier
 
     
     # Displays the board
     def display_board(self):
-        # For displaying the board (Defining: red = 0, green = 1, yellow = 2, blue = 3, purple = 4, black = 5)
-        cmap = colors.ListedColormap(['red', 'green', 'yellow', 'blue', 'purple', 'black'])
-        bounds = [0,1,2,3,4,5,6]
+        # For displaying the board (Defining: red = 0, green = 1, yellow = 2, blue = 3, purple = 4, black = 5,
+        # then colors from matplotlib's tab20 palette for boards with more colors)
+        color_names = ['red', 'green', 'yellow', 'blue', 'purple', 'black'] + list(plt.cm.tab20.colors)
+        cmap = colors.ListedColormap(color_names[:self.num_colors])
+        bounds = list(range(self.num_colors + 1))
         norm = colors.BoundaryNorm(bounds, cmap.N)
 
         _, ax = plt.subplots()
@@ -41,12 +246,12 @@ class Board:
     # Retuns the current game score. Necessary for evaluating when the game has ended (when the two scores add
     # up to the total number of celss for the given board size).
     def get_score(self):
-        return (len(self.player_1_cells_captured), len(self.player_2_cells_captured))
+        return (self.player_1_territory.bit_count(), self.player_2_territory.bit_count())
     
 
     # Function that returns what percentage of the board is captured. Useful in MCTS algorithm.
     def get_percentage_done(self):
-        return (len(self.player_1_cells_captured) + len(self.player_2_cells_captured)) / (self.size[0] * self.size[1])
+        return (self.player_1_territory | self.player_2_territory).bit_count() / (self.size[0] * self.size[1])
     
 
     # Returns the player color for a given player. Helpful in MCTS algorithm.
@@ -59,10 +264,21 @@ class Board:
                raise Exception("Invalid player number")
 
 
+    # Returns the number of uncaptured cells of each color bordering a player's territory, which is 
+    # how many cells each color would capture next turn
+    def get_frontier_counts(self, player_number):
+        if player_number == 1:
+            return self.player_1_frontier_counts
+        elif player_number == 2:
+            return self.player_2_frontier_counts
+        else:
+               raise Exception("Invalid player number")
+
+
     # Returns the possible legal moves for the current board state.
     # Necessary for MCTS algorithm.
     def legal_moves(self):
-        moves = [0,1,2,3,4,5]
+        moves = list(range(self.num_colors))
         moves.remove(self.player_1_color)
         moves.remove(self.player_2_color)
         return moves
@@ -81,6 +297,8 @@ class Board:
     # Takes the random generated board and fixes it so that no no cells with the same color are 
     # already touching to match the filler game. 
     def fix_board(self):
+        all_colors = list(range(self.num_colors))
+
         # Fixing blobs of colors
         for i in range(self.size[0]):
             for j in range(self.size[1]):
@@ -89,11 +307,11 @@ class Board:
                 for neighbor in neighbors:
                     neighbor_colors.append(self.data[neighbor[0], neighbor[1]])
                 if len(np.intersect1d([self.data[i,j]], neighbor_colors)) > 0:
-                    self.data[i,j] = random.choice(np.setdiff1d([0,1,2,3,4,5],neighbor_colors))
+                    self.data[i,j] = random.choice(np.setdiff1d(all_colors,neighbor_colors))
         
         # Fixing if starting colors of players are the same
         if self.data[self.size[0]-1,0] == self.data[0,self.size[1]-1]:
-            self.data[0,self.size[1]-1] = random.choice(np.setdiff1d([0,1,2,3,4,5],[self.data[0,self.size[1]-1], 
+            self.data[0,self.size[1]-1] = random.choice(np.setdiff1d(all_colors,[self.data[0,self.size[1]-1], 
                                             self.data[0,self.size[1]-2], self.data[1,self.size[1]-1]]))
         
         # Fixing to make sure a player can never start the game off with two neighbors of the same color
@@ -102,15 +320,52 @@ class Board:
             colors_to_avoid = []
             for cell in cells_to_avoid:
                 colors_to_avoid.append(self.data[cell[0], cell[1]])
-            self.data[self.size[0]-2,0] = random.choice(np.setdiff1d([0,1,2,3,4,5],colors_to_avoid))
+            self.data[self.size[0]-2,0] = random.choice(np.setdiff1d(all_colors,colors_to_avoid))
         if self.data[0, self.size[1]-2] == self.data[1, self.size[1]-1]:
             cells_to_avoid = [(0,self.size[1]-3), (0,self.size[1]-1), (1,self.size[1]-2), (1,self.size[1]-1)]
             colors_to_avoid = []
             for cell in cells_to_avoid:
                 colors_to_avoid.append(self.data[cell[0], cell[1]])
-            self.data[0,self.size[1]-2] = random.choice(np.setdiff1d([0,1,2,3,4,5],colors_to_avoid))
+            self.data[0,self.size[1]-2] = random.choice(np.setdiff1d(all_colors,colors_to_avoid))
        
             
+    # Copies this board's game state into a scratch board of the same size (e.g. one made earlier with 
+    # deepcopy) without allocating a new board. The scratch board's undo log is cleared.
+    def copy_into(self, board):
+        board.player_1_territory = self.player_1_territory
+        board.player_2_territory = self.player_2_territory
+        board.player_1_color = self.player_1_color
+        board.player_2_color = self.player_2_color
+        board.player_1_frontier = self.player_1_frontier
+        board.player_2_frontier = self.player_2_frontier
+        board.player_1_frontier_counts[:] = self.player_1_frontier_counts
+        board.player_2_frontier_counts[:] = self.player_2_frontier_counts
+        board.zobrist_hash = self.zobrist_hash
+        board.color_masks = self.color_masks # Never modified after the board is created
+        board.repaint_needed = True
+        board.undo_log.clear()
+
+
+    # Makes a move that can later be taken back with pop_move. The state before the move is saved
+    # on the undo log, so pushing and popping moves is much cheaper than copying the board.
+    def push_move(self, player_number, color_value):
+        self.undo_log.append((self.player_1_territory, self.player_2_territory, self.player_1_color, 
+                              self.player_2_color, self.player_1_frontier, self.player_2_frontier, 
+                              tuple(self.player_1_frontier_counts), tuple(self.player_2_frontier_counts), 
+                              self.zobrist_hash))
+        self.update_board(player_number, color_value)
+
+
+    # Takes back the last move made with push_move
+    def pop_move(self):
+        (self.player_1_territory, self.player_2_territory, self.player_1_color, self.player_2_color, 
+         self.player_1_frontier, self.player_2_frontier, player_1_frontier_counts, player_2_frontier_counts, 
+         self.zobrist_hash) = self.undo_log.pop()
+        self.player_1_frontier_counts[:] = player_1_frontier_counts
+        self.player_2_frontier_counts[:] = player_2_frontier_counts
+        self.repaint_needed = True
+
+
     # Updates the board based on the given player and the color value.
     def update_board(self, player_number, color_value):
         if player_number == 1:
@@ -119,49 +374,53 @@ class Board:
             if color_value == self.player_1_color:
                 raise Exception("Trying to choose your own color")
             
-            # Finding all neighboring cells with the given chosen color
-            neighbors = set()
-            for cell in self.player_1_cells_captured:
-                neighbors.update([(cell[0]+1,cell[1]), (cell[0]-1,cell[1]), 
-                                  (cell[0],cell[1]+1), (cell[0],cell[1]-1)])
-                self.data[cell] = color_value
-            neighbors -= self.player_1_cells_captured
-            neighbors -= self.player_2_cells_captured
-
-            # Finding valid neighbors adding to captured set if they have the same 
-            # color as the chosen color
-            neighbors = self.valid_neighbors(list(neighbors))  
-            for neighbor in neighbors:
-                if self.data[neighbor] == color_value:
-                    self.player_1_cells_captured.add(neighbor)
+            # Capturing all connected cells with the given chosen color
+            territory = self.capture(self.player_1_territory, self.player_2_territory, color_value)
+            gained = territory & ~self.player_1_territory
+            self.player_1_territory = territory
+            
+            # Updating both frontiers using only the gained cells
+            if gained:
+                self.player_1_frontier = self.grow_frontier(self.player_1_frontier, 
+                                                            self.player_1_frontier_counts, gained, color_value)
+                self.player_2_frontier_counts[color_value] -= (self.player_2_frontier & gained).bit_count()
+                self.player_2_frontier &= ~gained
+            
+            # Updating the position hash with the gained cells and the color change
+            color_keys = get_zobrist_keys(self.size, self.num_colors)[2][0]
+            self.zobrist_hash ^= (self.zobrist_cells(1, gained) ^ color_keys[self.player_1_color] 
+                                  ^ color_keys[color_value])
             
             # Updating player color
             self.player_1_color = color_value
+            self.repaint_needed = True
         
         elif player_number == 2:
             if color_value == self.player_1_color:
                 raise Exception("Trying to choose the color of the other player")
-            if color_value == self.player_1_color:
+            if color_value == self.player_2_color:
                 raise Exception("Trying to choose your own color")
             
-            # Finding all neighboring cells with the given chosen color
-            neighbors = set()
-            for cell in self.player_2_cells_captured:
-                neighbors.update([(cell[0]+1,cell[1]), (cell[0]-1,cell[1]), 
-                                  (cell[0],cell[1]+1), (cell[0],cell[1]-1)])
-                self.data[cell] = color_value
-            neighbors -= self.player_2_cells_captured
-            neighbors -= self.player_1_cells_captured
-
-            # Finding valid neighbors adding to captured set if they have the same 
-            # color as the chosen color
-            neighbors = self.valid_neighbors(neighbors)
-            for neighbor in neighbors:
-                if self.data[neighbor] == color_value:
-                    self.player_2_cells_captured.add(neighbor)
+            # Capturing all connected cells with the given chosen color
+            territory = self.capture(self.player_2_territory, self.player_1_territory, color_value)
+            gained = territory & ~self.player_2_territory
+            self.player_2_territory = territory
+            
+            # Updating both frontiers using only the gained cells
+            if gained:
+                self.player_2_frontier = self.grow_frontier(self.player_2_frontier, 
+                                                            self.player_2_frontier_counts, gained, color_value)
+                self.player_1_frontier_counts[color_value] -= (self.player_1_frontier & gained).bit_count()
+                self.player_1_frontier &= ~gained
+            
+            # Updating the position hash with the gained cells and the color change
+            color_keys = get_zobrist_keys(self.size, self.num_colors)[2][1]
+            self.zobrist_hash ^= (self.zobrist_cells(2, gained) ^ color_keys[self.player_2_color] 
+                                  ^ color_keys[color_value])
             
             # Updating player color
             self.player_2_color = color_value
+            self.repaint_needed = True
         
         else:
                raise Exception("Invalid player number")
@@ -171,78 +430,67 @@ class Board:
     # for a given player. Note, it returns the maximum legal move (it can't choose the other 
     # players current color).
     def greedy_move(self, player_number):
-        territory_neighbors = set()
-        num_colored_neighbors = np.zeros(6)        
-        
+        # The number of uncaptured neighboring cells of each color is kept up to date by update_board
         if player_number == 1:
-            # Finding all neighbors and adding them to the running total of num_colored_neighbors
-            for cell in self.player_1_cells_captured:
-                territory_neighbors.update(self.valid_neighbors([(cell[0]+1,cell[1]), (
-                    cell[0]-1,cell[1]), (cell[0],cell[1]+1), (cell[0],cell[1]-1)]))
-            for neighbor in territory_neighbors:
-                num_colored_neighbors[self.data[neighbor]] += 1            
-            
-            # Return the top color but checking to make sure we're not chossing the other player's color  
-            num_colored_neighbors[self.player_2_color] = -1
-            num_colored_neighbors[self.player_1_color] = -1
-            
-            # Returning a random choice of the best greedy moves
-            return np.random.choice(np.where(num_colored_neighbors == num_colored_neighbors.max())[0])
-        
-        elif player_number == 2:         
-            # Finding all neighbors and adding them to the running total of num_colored_neighbors
-            for cell in self.player_2_cells_captured:
-                territory_neighbors.update(self.valid_neighbors([(cell[0]+1,cell[1]), (
-                    cell[0]-1,cell[1]), (cell[0],cell[1]+1), (cell[0],cell[1]-1)])) 
-            for neighbor in territory_neighbors:
-                num_colored_neighbors[self.data[neighbor]] += 1       
-            
-            # Return the top color but checking to make sure we're not chossing the other player's color  
-            num_colored_neighbors[self.player_2_color] = -1
-            num_colored_neighbors[self.player_1_color] = -1
-
-            # Returning a random choice of the best greedy moves
-            return np.random.choice(np.where(num_colored_neighbors == num_colored_neighbors.max())[0])    
-        
+            num_colored_neighbors = np.array(self.player_1_frontier_counts)
+        elif player_number == 2:
+            num_colored_neighbors = np.array(self.player_2_frontier_counts)
         else:
                raise Exception("Invalid player number")
+        
+        # Return the top color but checking to make sure we're not chossing the other player's color  
+        num_colored_neighbors[self.player_2_color] = -1
+        num_colored_neighbors[self.player_1_color] = -1
+        
+        # Returning a random choice of the best greedy moves
+        return np.random.choice(np.where(num_colored_neighbors == num_colored_neighbors.max())[0])
 
     
-    # Helper function for the best_move_depth function
+    # Returns the most territory that can be reached from a territory (a bitboard) in moves_left moves.
+    # Only colors that gain cells are tried (a move that gains nothing is never better than one that 
+    # does), results are memoized on (territory, moves_left) in memo, and with prune a move is skipped
+    # when reachable_bound shows it can't beat the best found so far or bound. The result is exact
+    # whenever it is greater than bound, otherwise it's only known to be at most bound.
     # Note: This is recursive but not tail recursive
-    def best_move_depth_helper(self, territory, opponent_territory, depth, current_depth):
-        if current_depth > depth:
-            return len(territory)
-        else:
-            best_territory = 0 # amount of territory the best sequence of moves can get
-            
-            for i in range(6): # Possible 6 colors
-                territory_neighbors = set() # A set so that we only add neighboring cells once
-                
-                # Looping over all cells in the territory to find neighboring cells of color i
-                neighbors = set()
-                for cell in territory:
-                    neighbors.update([(cell[0]+1,cell[1]),(
-                        cell[0]-1,cell[1]), (cell[0],cell[1]+1), (cell[0],cell[1]-1)])
-                neighbors -= opponent_territory
-                neighbors -= territory
-
-                neighbors = self.valid_neighbors(list(neighbors))   
-                for neighbor in neighbors:
-                    if self.data[neighbor] == i:
-                        territory_neighbors.add(neighbor)
+    def best_move_depth_search(self, territory, opponent_territory, moves_left, bound, memo, prune):
+        if moves_left == 0:
+            return territory.bit_count()
+        key = (territory, moves_left)
+        if key in memo:
+            return memo[key]
+        
+        # Finding the territory after each move that gains cells, trying the biggest gains first
+        uncaptured_neighbors = self.neighbors_mask(territory) & ~(territory | opponent_territory)
+        next_territories = []
+        for color, mask in enumerate(self.color_masks):
+            if uncaptured_neighbors & mask:
+                next_territory = self.capture(territory, opponent_territory, color)
+                next_territories.append((next_territory.bit_count(), next_territory))
+        next_territories.sort(reverse=True)
+        
+        best_territory = territory.bit_count() # If no move gains anything
+        for _, next_territory in next_territories:
+            if prune and self.reachable_bound(next_territory, opponent_territory, moves_left-1) <= max(
+                    best_territory, bound):
+                continue
+            best_subsequent_territory = self.best_move_depth_search(next_territory, opponent_territory, 
+                                                                    moves_left-1, max(best_territory, bound), 
+                                                                    memo, prune)
+            if best_subsequent_territory > best_territory:
+                best_territory = best_subsequent_territory
+        
+        if best_territory > bound:
+            memo[key] = best_territory
+        return best_territory
 
-                # Finding the best territory that can be achieved by making move i up to 
-                # the given depth of moves using recursion
-                best_subsequent_territory = self.best_move_depth_helper(territory.union(
-                    territory_neighbors), opponent_territory, depth, current_depth+1)
-                
-                # Saving the best move
-                if best_subsequent_territory > best_territory:
-                    best_territory = best_subsequent_territory
 
-            # Returning the best territory
-            return best_territory
+    # Upper bound on the territory reachable in moves_left moves: every cell not owned by the opponent
+    # within moves_left steps. Only valid when no two uncaptured neighboring cells share a color.
+    def reachable_bound(self, territory, opponent_territory, moves_left):
+        reachable = territory
+        for _ in range(moves_left):
+            reachable |= self.neighbors_mask(reachable) & ~opponent_territory
+        return reachable.bit_count()
     
 
     # Returns the move that has a path to gain the most territory for a given depth of moves
@@ -254,42 +502,110 @@ class Board:
         
         # Keeping track of the maximum ammount of territory possible to gain
         # for a given move at a given depth
-        best_territory_by_move = np.zeros(6)
+        best_territory_by_move = np.zeros(self.num_colors)
         
         # Storing correct player information
         if player_number == 1:
-            player_territory = self.player_1_cells_captured
-            opponent_territory = self.player_2_cells_captured
+            player_territory = self.player_1_territory
+            opponent_territory = self.player_2_territory
         elif player_number == 2:
-            player_territory = self.player_2_cells_captured
-            opponent_territory = self.player_1_cells_captured
+            player_territory = self.player_2_territory
+            opponent_territory = self.player_1_territory
         else:
             raise Exception("Invalid player number")
+        
+        # Pruning relies on every move capturing only cells next to the territory, which fix_board 
+        # guarantees but boards created from data might not
+        uncaptured = self.full_mask & ~(player_territory | opponent_territory)
+        prune = not any(self.neighbors_mask(mask & uncaptured) & mask & uncaptured for mask in self.color_masks)
+        memo = {}
 
-        # Looping over legal moves to find the best one at a given depth
-        for move in self.legal_moves():
-            territory_neighbors = set()
-            
-            # Looping over all cells in the territory to find neighboring cells 
-            # of the color of the move
-            neighbors = set()
-            for cell in player_territory:
-                neighbors.update([(cell[0]+1,cell[1]),(
-                        cell[0]-1,cell[1]), (cell[0],cell[1]+1), (cell[0],cell[1]-1)])
-            neighbors -= opponent_territory
-            neighbors -= player_territory            
-
-            neighbors = self.valid_neighbors(neighbors)   
-            for neighbor in neighbors:
-                if self.data[neighbor] == move:
-                    territory_neighbors.add(neighbor)
-            
-            # Calling the helper function to find the best possible territory to capture after 
-            # the given depth of moves
-            best_territory_by_move[move] = self.best_move_depth_helper(player_territory.union(
-                territory_neighbors), opponent_territory, depth, 2)
-
-        #print(f"The most possible territory with move {move} is {np.argmax(best_territory_by_move)}")
+        # Looping over legal moves (biggest immediate gain first) to find the best one at a given depth. 
+        # Moves are only pruned if they can't tie the best one so ties are still broken randomly.
+        best_territory = 0
+        next_territories = [(self.capture(player_territory, opponent_territory, move), move) 
+                            for move in self.legal_moves()]
+        next_territories.sort(key=lambda next_move: next_move[0].bit_count(), reverse=True)
+        for next_territory, move in next_territories:
+            # Finding the best possible territory to capture after the given depth of moves
+            best_territory_by_move[move] = self.best_move_depth_search(next_territory, opponent_territory, 
+                                                                       depth-1, best_territory-1, memo, prune)
+            best_territory = max(best_territory, best_territory_by_move[move])
         
         # Returning a random choice of the best moves at the given depth
         return np.random.choice(np.where(best_territory_by_move == best_territory_by_move.max())[0])
+
+
+
+# Number of boards generated from each random stream by generate_boards. Board i of a seed always comes
+# from stream (seed, i // board_chunk_size), so any board can be generated again on its own.
+board_chunk_size = 4096
+
+# Returns a random color for each board, uniform over the num_colors colors not in any of the excluded arrays
+def random_colors_excluding(generator, excluded, num_colors = 6):
+    allowed = np.ones((len(excluded[0]), num_colors), dtype=bool)
+    for excluded_colors in excluded:
+        allowed[np.arange(len(excluded_colors)), excluded_colors] = False
+    keys = generator.random(allowed.shape)
+    keys[~allowed] = -1
+    return np.argmax(keys, axis=1).astype(np.int8)
+
+
+# Generates the chunk of boards from one random stream. Cells are colored one anti-diagonal at a time,
+# since a cell only has to differ from the cells above and to the left of it, which are both on the 
+# previous anti-diagonal. Each cell gets a uniformly random color among the allowed ones.
+def generate_board_chunk(size, seed, chunk, num_colors = 6):
+    generator = np.random.default_rng([seed, chunk])
+    rows, columns = size
+    # Row 0 / column 0 are padding
+    boards = np.full((board_chunk_size, rows + 1, columns + 1), num_colors, dtype=np.int8)
+    for diagonal in range(rows + columns - 1):
+        i = np.arange(max(0, diagonal - columns + 1), min(rows, diagonal + 1)) + 1
+        j = diagonal - i + 2
+        # Drawing from the colors minus the (up to two) distinct colors above and to the left. Missing
+        # neighbors are padding (color num_colors), which is above every color so it never shifts the draw.
+        above, left = boards[:, i - 1, j], boards[:, i, j - 1]
+        lowest, highest = np.minimum(above, left), np.maximum(above, left)
+        distinct = highest != lowest
+        num_excluded = (lowest < num_colors).astype(np.int8) + (distinct & (highest < num_colors))
+        cell_colors = generator.integers(0, num_colors - num_excluded).astype(np.int8)
+        cell_colors += cell_colors >= lowest
+        cell_colors += (cell_colors >= highest) & distinct
+        boards[:, i, j] = cell_colors
+    boards = boards[:, 1:, 1:]
+
+    # Applying the same starting position rules as fix_board: the players start with different colors,
+    # and neither player starts next to two cells of the same color
+    same_start = np.flatnonzero(boards[:, rows-1, 0] == boards[:, 0, columns-1])
+    boards[same_start, 0, columns-1] = random_colors_excluding(generator, [
+        boards[same_start, 0, columns-1], boards[same_start, 0, columns-2], boards[same_start, 1, columns-1]], num_colors)
+    same_neighbors = np.flatnonzero(boards[:, rows-2, 0] == boards[:, rows-1, 1])
+    boards[same_neighbors, rows-2, 0] = random_colors_excluding(generator, [
+        boards[same_neighbors, rows-3, 0], boards[same_neighbors, rows-1, 0], 
+        boards[same_neighbors, rows-2, 1], boards[same_neighbors, rows-1, 1]], num_colors)
+    same_neighbors = np.flatnonzero(boards[:, 0, columns-2] == boards[:, 1, columns-1])
+    boards[same_neighbors, 0, columns-2] = random_colors_excluding(generator, [
+        boards[same_neighbors, 0, columns-3], boards[same_neighbors, 0, columns-1], 
+        boards[same_neighbors, 1, columns-2], boards[same_neighbors, 1, columns-1]], num_colors)
+    return boards
+
+
+# Returns boards start to start+num_boards-1 of the given seed as one stacked array of colors with shape
+# (num_boards, rows, columns). The boards follow the same rules fix_board enforces and are the same for
+# the same seed, size and number of colors no matter how they are split into calls. Use 
+# Board(data=boards[i], num_colors=num_colors) to play one.
+def generate_boards(num_boards, size = (7,8), seed = 0, start = 0, num_colors = 6):
+    if size[0] < 3 or size[1] < 3:
+        raise Exception("Boards must be at least 3x3")
+    if num_colors < 5:
+        raise Exception("Boards need at least 5 colors")
+    first_chunk, last_chunk = start // board_chunk_size, (start + num_boards - 1) // board_chunk_size
+    boards = np.concatenate([generate_board_chunk(size, seed, chunk, num_colors) 
+                             for chunk in range(first_chunk, last_chunk + 1)])
+    offset = start - first_chunk * board_chunk_size
+    return boards[offset:offset + num_boards]
+
+
+# Returns board number index of the given seed (see generate_boards) as a Board
+def generate_board(index, size = (7,8), seed = 0, num_colors = 6):
+    return Board(data=generate_boards(1, size, seed, index, num_colors)[0].astype(int), num_colors=num_colors)
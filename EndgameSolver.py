@@ -0,0 +1,103 @@
+from time import time
+from RegionGraph import RegionGraph
+
+"""
+EndgameSolver Class: Solves the end of a Filler game exactly with an alpha-beta (negamax) search over
+a RegionGraph of the position, so moves only absorb regions and no cells are touched. The value of a
+position is the final score margin (the player to move's cells minus the other player's), so the best
+move wins whenever a win is possible and then wins (or loses) by as much (or as little) as possible.
+Solved positions are kept in a transposition cache keyed by both territories and colors, and moves
+are tried largest gain first (the cached best move first).
+Moves that capture nothing are legal, so both players could pass back and forth forever. Lines longer
+than max_plies are scored by their current margin, which only matters if both players choose to pass.
+Takes in the following parameters:
+    - board: Board at the position to solve
+    - node_budget: Maximum number of positions searched before giving up (see solve)
+    - max_plies: Maximum length of a searched line of moves (None for two per uncaptured cell)
+    - deadline: time.time() value after which the search gives up like when out of budget (None for no limit)
+"""
+class EndgameSolver:
+    # Cache entry types: the value is exact, a lower bound or an upper bound
+    exact, lower_bound, upper_bound = 0, 1, 2
+
+    def __init__(self, board, node_budget = 200000, max_plies = None, deadline = None):
+        self.graph = RegionGraph(board)
+        self.node_budget = node_budget
+        self.deadline = deadline
+        uncaptured_cells = self.graph.board_size - sum(self.graph.get_score())
+        self.max_plies = max_plies if max_plies is not None else 2 * uncaptured_cells + 2
+        self.cache = {} # position -> (plies searched, entry type, value, best move)
+        self.num_nodes = 0
+        self.out_of_budget = False
+
+
+    # Returns the final score margin of the position for the given player
+    def margin(self, player_number):
+        score = self.graph.get_score()
+        return score[0] - score[1] if player_number == 1 else score[1] - score[0]
+
+
+    # Returns the player to move's best move and its value (the score margin) by alpha-beta search,
+    # with the player's moves ordered by how many cells they capture
+    def search(self, player_number, alpha, beta, plies_left):
+        self.num_nodes += 1
+        # The clock is only checked every 256 positions since it is slower than searching one
+        if self.num_nodes > self.node_budget or (self.deadline is not None and self.num_nodes % 256 == 0 
+                                                 and time() >= self.deadline):
+            self.out_of_budget = True
+            return None, 0
+        graph = self.graph
+        if sum(graph.get_score()) == graph.board_size or plies_left == 0:
+            return None, self.margin(player_number)
+
+        # Using the cached result if it was searched at least as deep
+        key = (graph.player_1_territory, graph.player_2_territory, graph.player_1_color, graph.player_2_color,
+               player_number)
+        entry = self.cache.get(key)
+        cached_move = None
+        if entry is not None:
+            entry_plies, entry_type, entry_value, cached_move = entry
+            if entry_plies >= plies_left:
+                if (entry_type == self.exact or (entry_type == self.lower_bound and entry_value >= beta)
+                    or (entry_type == self.upper_bound and entry_value <= alpha)):
+                    return cached_move, entry_value
+
+        moves = sorted(graph.legal_moves(), key=lambda move: (move == cached_move,
+                                                              graph.gained_cells(player_number, move)), reverse=True)
+        other_player = 1 if player_number == 2 else 2
+        original_alpha = alpha
+        best_move, best_value = None, None
+        state = graph.get_state()
+        for move in moves:
+            graph.update_board(player_number, move)
+            _, value = self.search(other_player, -beta, -alpha, plies_left - 1)
+            graph.set_state(state)
+            if self.out_of_budget:
+                return None, 0
+            value = -value
+            if best_value is None or value > best_value:
+                best_move, best_value = move, value
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            entry_type = self.upper_bound
+        elif best_value >= beta:
+            entry_type = self.lower_bound
+        else:
+            entry_type = self.exact
+        self.cache[key] = (plies_left, entry_type, best_value, best_move)
+        return best_move, best_value
+
+
+    # Solves the position for the player to move. Returns the best move and its final score margin, or
+    # None if the search needed more than node_budget positions or ran past the deadline.
+    def solve(self, player_number):
+        self.num_nodes = 0
+        self.out_of_budget = False
+        board_size = self.graph.board_size
+        move, value = self.search(player_number, -board_size - 1, board_size + 1, self.max_plies)
+        if self.out_of_budget:
+            return None
+        return move, value
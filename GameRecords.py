@@ -0,0 +1,162 @@
+import os
+import numpy as np
+from Board import Board
+
+"""
+GameRecords Class: A file of finished games stored as fixed-width NumPy records, so a file of millions
+of games can be memory-mapped and scanned (e.g. for scores) without reading it all into memory. Each
+record holds the starting board and the moves (colors) packed two per byte, the number of moves, the
+final score and optionally the MCTS root statistics (the visits and average value of each color) of
+every move. The file starts with a small header giving the board size, the maximum number of moves,
+whether root statistics are stored and the number of colors, followed by the records.
+Takes in the following parameters:
+    - path: File to read from and append to. If it exists, its own header is used.
+    - size: Board size of the games (only needed to create a new file)
+    - max_moves: Maximum number of moves in a game (default: four times the number of cells, enough
+        for random games, which can pass many times)
+    - root_stats: Whether the file stores MCTS root statistics for every move
+    - num_colors: Number of colors of the games' boards (at most 15 since colors are packed in four bits)
+"""
+class GameRecords:
+    magic = b"FILLREC1"
+    header_size = 64
+    no_move = 15 # Packed value of the unused move slots
+
+    def __init__(self, path, size = None, max_moves = None, root_stats = False, num_colors = 6):
+        self.path = path
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as records_file:
+                header = records_file.read(self.header_size)
+            if header[:len(self.magic)] != self.magic:
+                raise Exception(f"{path} is not a game records file")
+            rows, columns, max_moves, root_stats, num_colors = np.frombuffer(header, dtype="<u4", count=5, 
+                                                                             offset=len(self.magic))
+            self.size = (int(rows), int(columns))
+            self.max_moves = int(max_moves)
+            self.root_stats = bool(root_stats)
+            self.num_colors = int(num_colors) if num_colors > 0 else 6 # Files from before it was stored
+        else:
+            if size is None:
+                raise Exception("The board size is needed to create a game records file")
+            self.size = tuple(size)
+            self.max_moves = max_moves if max_moves is not None else 4 * self.size[0] * self.size[1]
+            self.root_stats = root_stats
+            if num_colors > self.no_move:
+                raise Exception(f"Game records support at most {self.no_move} colors")
+            self.num_colors = num_colors
+            header = self.magic + np.array([self.size[0], self.size[1], self.max_moves, self.root_stats, 
+                                            self.num_colors], dtype="<u4").tobytes()
+            with open(path, "wb") as records_file:
+                records_file.write(header.ljust(self.header_size, b"\0"))
+
+        fields = [("board", np.uint8, ((self.size[0] * self.size[1] + 1) // 2,)), ("num_moves", "<u2"),
+                  ("moves", np.uint8, ((self.max_moves + 1) // 2,)), ("score", "<u2", (2,))]
+        if self.root_stats:
+            fields += [("visits", "<u4", (self.max_moves, self.num_colors)), 
+                       ("values", "<f2", (self.max_moves, self.num_colors))]
+        self.dtype = np.dtype(fields)
+
+
+    # Number of games in the file
+    def __len__(self):
+        return (os.path.getsize(self.path) - self.header_size) // self.dtype.itemsize
+
+
+    # Packs an array of values below 16 into bytes, two per byte (the first in the low four bits)
+    def pack(self, values, length):
+        padded = np.full(2 * length, self.no_move, dtype=np.uint8)
+        padded[:len(values)] = values
+        return padded[0::2] | (padded[1::2] << 4)
+
+
+    # Unpacks stacked packed bytes into stacked values (the inverse of pack)
+    def unpack(self, packed, length):
+        values = np.empty(packed.shape[:-1] + (2 * packed.shape[-1],), dtype=np.uint8)
+        values[..., 0::2] = packed & 15
+        values[..., 1::2] = packed >> 4
+        return values[..., :length]
+
+
+    # Appends a game given by its starting board colors and list of moves (player 1 moves first).
+    # The final score is found by replaying the moves. stats can give the MCTS root statistics of each
+    # move as (visits, values) arrays indexed by color (see MCTS.root_statistics), or None for moves
+    # that weren't searched.
+    def append(self, board_data, moves, stats = None):
+        self.append_games([board_data], [moves], None if stats is None else [stats])
+
+
+    # Appends many games at once (see append)
+    def append_games(self, boards_data, games_moves, games_stats = None):
+        records = np.zeros(len(boards_data), dtype=self.dtype)
+        for inx, (board_data, moves) in enumerate(zip(boards_data, games_moves)):
+            if len(moves) > self.max_moves:
+                raise Exception(f"Game has {len(moves)} moves but the file stores at most {self.max_moves}")
+            board = Board(data=np.array(board_data, dtype=int), num_colors=self.num_colors)
+            if board.size != self.size:
+                raise Exception(f"Board size {board.size} doesn't match the file's size {self.size}")
+            if board.num_colors != self.num_colors:
+                raise Exception(f"Board has {board.num_colors} colors but the file's games have {self.num_colors}")
+            records[inx]["board"] = self.pack(np.ravel(board_data), len(records[inx]["board"]))
+            records[inx]["num_moves"] = len(moves)
+            records[inx]["moves"] = self.pack(moves, len(records[inx]["moves"]))
+            for move_number, move in enumerate(moves):
+                board.update_board(move_number % 2 + 1, move)
+            records[inx]["score"] = board.get_score()
+            if games_stats is not None and self.root_stats:
+                for move_number, move_stats in enumerate(games_stats[inx]):
+                    if move_stats is not None:
+                        records[inx]["visits"][move_number], records[inx]["values"][move_number] = move_stats
+        with open(self.path, "ab") as records_file:
+            records_file.write(records.tobytes())
+
+
+    # Drops every game after the first num_games
+    def truncate(self, num_games):
+        if num_games < len(self):
+            os.truncate(self.path, self.header_size + num_games * self.dtype.itemsize)
+
+
+    # Returns all the records memory-mapped (read-only) as a structured array, e.g. records()["score"]
+    def records(self):
+        if len(self) == 0:
+            return np.zeros(0, dtype=self.dtype) # Empty files can't be memory-mapped
+        return np.memmap(self.path, dtype=self.dtype, mode="r", offset=self.header_size, shape=(len(self),))
+
+
+    # Returns the starting boards of the given records as a stacked array of colors
+    def boards(self, records):
+        cells = self.unpack(records["board"], self.size[0] * self.size[1])
+        return cells.reshape(cells.shape[:-1] + self.size).astype(int)
+
+
+    # Returns the moves of a record as a list of colors
+    def moves(self, record):
+        return [int(move) for move in self.unpack(record["moves"], int(record["num_moves"]))]
+
+
+    # Returns game number index as its starting Board and list of moves
+    def game(self, index):
+        record = self.records()[index]
+        return Board(data=self.boards(record), num_colors=self.num_colors), self.moves(record)
+
+
+    # Streams the positions of game number index: yields the player to move and the Board before each
+    # move along with the move played, then (None, final Board, None). The same Board is updated in place,
+    # so copy it to keep a position.
+    def replay(self, index):
+        board, moves = self.game(index)
+        for move_number, move in enumerate(moves):
+            player_number = move_number % 2 + 1
+            yield player_number, board, move
+            board.update_board(player_number, move)
+        yield None, board, None
+
+
+    # Streams every game in the file as its starting Board and list of moves, reading the memory-mapped
+    # file batch_size games at a time
+    def games(self, batch_size = 4096):
+        records = self.records()
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            for board_data, record in zip(self.boards(batch), batch):
+                yield Board(data=board_data, num_colors=self.num_colors), self.moves(record)
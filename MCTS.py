@@ -1,9 +1,15 @@
 import numpy as np
-from random import random, choice
-from math import log, sqrt
+from random import random, choice, choices, seed as random_seed
+from multiprocessing import Pool
 from Board import Board
+from BatchSimulator import BatchSimulator
+from TranspositionTable import TranspositionTable
+from NodePool import NodePool
+from EndgameSolver import EndgameSolver
+from Profiler import Profiler
 from copy import deepcopy
-from time import time
+from math import log, exp
+from time import time, perf_counter
 
 """
 MCTS Class: Performs a Monte Carlo Tree Search on a given board to find the best next move
@@ -16,75 +22,108 @@ Takes in the following parameters:
         This helps to avoid paths that look like the AI would win most of the time but are very 
         unlikely to happen if the opponent has some level of intelligence (picks a color that blocks
         the AI from following that game path). 
+    - rollouts_per_child: Number of games simulated for each newly expanded node. When it is
+        greater than one, all the games of an expansion are played at once by a BatchSimulator.
+    - transposition_table_size: If given, the statistics of each position reached after the player's
+        moves are also stored in a TranspositionTable of this many positions. Selection then values 
+        a child by the shared statistics of its position, however that position was reached.
+    - max_nodes: Maximum number of nodes in the search tree (None for no limit). Once the tree is
+        full, leaves are simulated without being expanded.
+    - confidence: Confidence level of the bounds on the root children's values used to stop the
+        search early and to tell apart moves in decided games (see select_move).
+    - rollout_policy: How both players choose their moves in simulated games. "random" chooses uniformly,
+        "epsilon_greedy" chooses the move capturing the most cells (or a random one with probability
+        rollout_epsilon) and "softmax" chooses moves with probability proportional to 
+        exp(cells captured / rollout_temperature). The informed policies use the frontier counts the
+        board keeps up to date (Board.get_frontier_counts), so they cost little more than random moves.
+    - rollout_epsilon, rollout_temperature: Parameters of the "epsilon_greedy" and "softmax" policies
+    - endgame_cells: Once at most this many cells are uncaptured, select_move solves the rest of the
+        game exactly with an EndgameSolver instead of searching (None to always search)
+    - endgame_node_budget: Maximum number of positions the EndgameSolver may search. If the endgame
+        needs more, select_move searches as usual.
 """
 class MCTS: 
     def __init__(self, current_board, player, 
-                 exploration_parameter = 2, intelligence_parameter = 0.5):
-        self.game_board = deepcopy(current_board)
-        self.search_board = deepcopy(self.game_board)
+                 exploration_parameter = 2, intelligence_parameter = 0.5, rollouts_per_child = 1,
+                 transposition_table_size = None, max_nodes = None, confidence = 0.95,
+                 endgame_cells = 12, endgame_node_budget = 50000, rollout_policy = "random", 
+                 rollout_epsilon = 0.1, rollout_temperature = 1.0):
+        if current_board.num_colors > NodePool.max_colors:
+            raise Exception(f"The search tree supports at most {NodePool.max_colors} colors")
+        self.num_board_copies = 0
+        self.game_board = self.copy_board(current_board)
+        self.search_board = self.copy_board(self.game_board)
         self.player = player
         self.other_player = 1 if self.player == 2 else 2
         self.exploration_parameter = exploration_parameter
         self.intelligence_parameter = intelligence_parameter
+        self.rollouts_per_child = rollouts_per_child
+        self.confidence = confidence
+        self.endgame_cells = endgame_cells
+        if rollout_policy not in ["random", "epsilon_greedy", "softmax"]:
+            raise Exception(f"Invalid rollout policy {rollout_policy}")
+        self.rollout_policy = rollout_policy
+        self.rollout_epsilon = rollout_epsilon
+        self.rollout_temperature = rollout_temperature
+        self.endgame_node_budget = endgame_node_budget
+        self.transposition_table = None
+        if transposition_table_size is not None:
+            self.transposition_table = TranspositionTable(transposition_table_size)
+        self.selection_keys = [] # Position hashes along the last selected path
+        self.last_num_iterations = 0 # Iterations run by the last select_move
+        self.last_solution = None # (move, final score margin) if the last select_move solved the endgame
+        self.profiler = None # Only set while select_move records a report
+        self.last_report = None # Report of the last select_move that asked for one
+        self.ponder_move = None # If set, every iteration starts with this root move (see ponder)
 
-        # Initializing the root node and its children
-        self.root_node = self.Node(0) # (its color doesn't matter)
-        legal_moves = self.game_board.legal_moves()
-        for move in legal_moves:
-            self.root_node.add_child(move)
-            
-            
-    """
-    Node Class: Used to build out the search tree. 
-    Each node stores the number of times it's been visited, the color of its update to the board,
-    the number of wins recorded for it and all its children's nodes, a score_value based on how high 
-    an average score was achieved, a list of its children, and a pointer to its parent node.
-    """
-    class Node:
-        def __init__(self, color, parent = None):
-            self.num_visits = 1
-            self.color = color
-            self.num_wins = 0
-            self.score_value = 0
-            self.children = []
-            self.parent = parent
-            
-        def add_child(self, color):
-            child = self.__class__(color, self)
-            self.children.append(child)
-        
-        def update(self, win_loss, score_value):
-            self.num_visits += 1
-            self.num_wins += win_loss
-            self.score_value += score_value
+        # Initializing the search tree with the root node and its children. Each node stores the 
+        # number of times it's been visited, the color of its update to the board, the number of wins 
+        # recorded for it and all its children's nodes, and a score_value based on how high an average 
+        # score was achieved (see NodePool).
+        self.tree = NodePool(max_nodes = max_nodes)
+        self.root_node = self.tree.add_root(0) # (its color doesn't matter)
+        self.tree.add_children(self.root_node, self.game_board.legal_moves())
      
     
-    # Selection step of the MCTS algorithm.       
+    # Returns a deep copy of a board, counting the copies for the search report
+    def copy_board(self, board):
+        self.num_board_copies += 1
+        return deepcopy(board)
+    
+    
+    # Selection step of the MCTS algorithm. The search board is a scratch copy of the game board that
+    # is reset in place every iteration instead of being copied.
     def select(self):
-        self.search_board = deepcopy(self.game_board)
+        self.game_board.copy_into(self.search_board)
         current_node = self.root_node
+        self.selection_keys = []
         
         # Searching till we finally select a leaf node
-        while len(current_node.children) > 0:
-            selected_child = None
-            best_weight = 0.0
-            
-            # Looping over all children
-            for child in current_node.children:
-                # Making sure we don't select a node whose color is the same as the other player's
-                if child.color != self.search_board.get_color(self.other_player):
-                    weight = (child.num_wins + child.score_value) / child.num_visits + self.exploration_parameter * (
-                        sqrt(log(current_node.num_visits) / child.num_visits))
-                    if weight >= best_weight:
-                        best_weight = weight
-                        selected_child = child
-            
-            # Stepping down the tree to the selected child
-            current_node = selected_child
+        while self.tree.num_children[current_node] > 0:
+            if current_node == self.root_node and self.ponder_move is not None:
+                # Pondering, so only searching under the move that was already chosen
+                current_node = self.root_child(self.ponder_move)
+            else:
+                values = None
+                
+                # Using the shared statistics of each child's position if it's been seen before
+                if self.transposition_table is not None:
+                    values = self.tree.child_values(current_node)
+                    for inx, child in enumerate(self.tree.children(current_node)):
+                        entry = self.transposition_table.lookup(self.search_board.hash_after(
+                            self.player, self.tree.color[child]))
+                        if entry is not None:
+                            values[inx] = (entry[1] + entry[2]) / entry[0]
+                
+                # Stepping down the tree to the child with the best UCT weight, making sure we don't 
+                # select a node whose color is the same as the other player's
+                current_node = self.tree.select_child(current_node, self.exploration_parameter, 
+                                                      self.search_board.get_color(self.other_player), values)
             
             # Updating the search board for player and other player. Updates with a random choice
             # or a best move with probabilty based on the given intelligence_parameter
-            self.search_board.update_board(self.player, current_node.color)      
+            self.search_board.update_board(self.player, self.tree.color[current_node])      
+            self.selection_keys.append(self.search_board.zobrist_hash)
             if random() > self.intelligence_parameter:
                 self.search_board.update_board(self.other_player, 
                                                choice(self.search_board.legal_moves()))
@@ -94,86 +133,429 @@ class MCTS:
                 # able to happen near the end of the game
                 percentage_done = self.search_board.get_percentage_done()
                 if percentage_done < 0.5:
-                    self.search_board.update_board(self.other_player, self.search_board.best_move_depth(
-                        self.other_player, 3))
+                    depth = 3
                 elif percentage_done < 0.75: 
-                    self.search_board.update_board(self.other_player, self.search_board.best_move_depth(
-                        self.other_player, 2))
+                    depth = 2
                 else:
-                    self.search_board.update_board(self.other_player, self.search_board.best_move_depth(
-                        self.other_player, 1))
+                    depth = 1
+                if self.profiler is not None:
+                    start_time = perf_counter()
+                move = self.search_board.best_move_depth(self.other_player, depth)
+                if self.profiler is not None:
+                    self.profiler.record("opponent_model", start_time)
+                self.search_board.update_board(self.other_player, move)
         
         # Returning the selected leaf node
         return current_node
     
     
-    # Expantion step of the MCTS algorithm.    
+    # Expantion step of the MCTS algorithm. Returns False if the tree is full and the node wasn't expanded.
     def expand(self, selected_node):
-        colors = [0,1,2,3,4,5]
+        colors = list(range(self.search_board.num_colors))
         colors.remove(self.search_board.get_color(self.player))
-        for color in colors:
-            selected_node.add_child(color)
+        if not self.tree.has_room(len(colors)):
+            return False
+        self.tree.add_children(selected_node, colors)
+        return True
+    
     
+    # Returns a player's move in a simulated game, chosen with the rollout policy
+    def rollout_move(self, board, player_number):
+        moves = board.legal_moves()
+        if self.rollout_policy == "random":
+            return choice(moves)
+        counts = board.get_frontier_counts(player_number)
+        if self.rollout_policy == "epsilon_greedy":
+            if random() < self.rollout_epsilon:
+                return choice(moves)
+            most_captured = max(counts[move] for move in moves)
+            return choice([move for move in moves if counts[move] == most_captured])
+        most_captured = max(counts[move] for move in moves) # Subtracted so exp can't overflow
+        return choices(moves, [exp((counts[move] - most_captured) / self.rollout_temperature) for move in moves])[0]
     
-    # Simulation step of the MCTS algorithm.    
+    
+    # Simulation step of the MCTS algorithm. The simulated moves are taken back afterwards, so the 
+    # board is left as it was given. The simulation stops as soon as one player holds more than half 
+    # the board, since the winner can't change after that. The uncaptured cells are then split between
+    # the players in proportion to their territories to estimate the final score.
     def simulate(self, board):
         board_size = board.size[0]*board.size[1]
+        num_moves = len(board.undo_log)
         
         # Playing out the simulation
-        while sum(board.get_score()) < board_size:
-            board.update_board(self.other_player, choice(board.legal_moves()))
-            board.update_board(self.player, choice(board.legal_moves()))
-        
-        # Returning the result
         score = board.get_score()
+        while sum(score) < board_size and 2 * max(score) <= board_size:
+            board.push_move(self.other_player, self.rollout_move(board, self.other_player))
+            board.push_move(self.player, self.rollout_move(board, self.player))
+            score = board.get_score()
+        
+        # Taking back the simulated moves and returning the result
+        if self.profiler is not None:
+            self.profiler.add_rollouts(1, len(board.undo_log) - num_moves)
+        while len(board.undo_log) > num_moves:
+            board.pop_move()
+        score_value = score[self.player - 1] / sum(score) # The estimated final share of the board
         if self.player == 1:
             if score[0] > score[1]:
-                return (1, score[0] / board_size) 
+                return (1, score_value) 
             else:
-                return (0, score[0] / board_size)
+                return (0, score_value)
         else:
             if score[1] > score[0]:
-                return (1, score[1] / board_size)
+                return (1, score_value)
             else:
-                return (0, score[1] / board_size)
+                return (0, score_value)
+    
+    
+    # Simulation step of the MCTS algorithm for many games at once. Plays rollouts_per_child games after
+    # each of the player's given moves on the board, and returns arrays of the total wins and total 
+    # score values per move. The moves are made inside the BatchSimulator so the board isn't copied.
+    # Boards too wide for the BatchSimulator (over 64 columns) play the games one at a time instead.
+    def simulate_batch(self, board, moves):
+        num_games = len(moves) * self.rollouts_per_child
+        if board.size[1] > 64:
+            wins, score_values = np.zeros(len(moves)), np.zeros(len(moves))
+            for inx, move in enumerate(moves):
+                board.push_move(self.player, move)
+                for _ in range(self.rollouts_per_child):
+                    win_loss, score_value = self.simulate(board)
+                    wins[inx] += win_loss
+                    score_values[inx] += score_value
+                board.pop_move()
+            return wins, score_values
+        simulator = BatchSimulator([board] * num_games, self.rollout_policy, self.rollout_epsilon, 
+                                   self.rollout_temperature)
+        simulator.update_boards(self.player, np.arange(num_games), np.repeat(moves, self.rollouts_per_child))
+        wins, score_values = simulator.simulate(self.player, self.other_player)
+        if self.profiler is not None:
+            self.profiler.add_rollouts(num_games, simulator.num_moves)
+        return (wins.reshape(len(moves), -1).sum(axis=1), 
+                score_values.reshape(len(moves), -1).sum(axis=1))
     
     
-    # Backpropagation step of the MCTS algorithm.    
-    def backpropagate(self, node, win_loss, score_value):
-        current_node = node
-        while current_node != None:
-            current_node.update(win_loss, score_value)
-            current_node = current_node.parent
+    # Backpropagation step of the MCTS algorithm. The win_loss and score_value can be totals over
+    # num_simulations simulated games. With a transposition table, the positions along the selected
+    # path and the simulated node's position (position_key) are updated as well.
+    def backpropagate(self, node, win_loss, score_value, num_simulations = 1, position_key = None):
+        self.tree.backpropagate(node, win_loss, score_value, num_simulations)
+        
+        if self.transposition_table is not None:
+            for key in self.selection_keys + [position_key]:
+                self.transposition_table.update(key, win_loss, score_value, num_simulations)
      
 
-    # Returning the final best move after running the MCTS algorithm with num_iterations.     
-    def select_move(self, num_iterations = 100, verbose = False):
-        for _ in range(num_iterations):
-            selected_node = self.select()
-            self.expand(selected_node)
+    # Calls a step of the search, recording its time and call count if a report is being recorded
+    def timed(self, phase, step, *args, **kwargs):
+        if self.profiler is None:
+            return step(*args, **kwargs)
+        start_time = perf_counter()
+        result = step(*args, **kwargs)
+        self.profiler.record(phase, start_time)
+        return result
+
+
+    # Runs num_iterations of selection, expansion, simulation and backpropagation on the tree, or until
+    # the deadline (a time.time() value) passes. num_iterations can be None to only stop at the deadline.
+    # With early_stopping, it also stops once the best root move is decided (see is_decided), checking
+    # every check_interval iterations. Returns the number of iterations that were run.
+    def run_iterations(self, num_iterations, deadline = None, early_stopping = False, check_interval = 10):
+        iteration = 0
+        while num_iterations is None or iteration < num_iterations:
+            if deadline is not None and time() >= deadline:
+                break
+            if early_stopping and iteration % check_interval == 0 and self.is_decided():
+                break
+            iteration += 1
+            
+            selected_node = self.timed("select", self.select)
+            if not self.timed("expand", self.expand, selected_node):
+                # The tree is full so simulating from the selected node with a random move of its own
+                self.search_board.push_move(self.player, self.rollout_move(self.search_board, self.player))
+                position_key = self.search_board.zobrist_hash
+                simulation_results = self.timed("simulate", self.simulate, self.search_board)
+                self.search_board.pop_move()
+                self.timed("backpropagate", self.backpropagate, selected_node, simulation_results[0], 
+                           simulation_results[1], position_key = position_key)
+                continue
             
-            for child in selected_node.children:
-                if child.color != self.search_board.get_color(self.other_player):
-                    expansion_board = deepcopy(self.search_board)
-                    expansion_board.update_board(self.player, child.color)
-                    simulation_results = self.simulate(expansion_board)
-                    self.backpropagate(child, simulation_results[0], simulation_results[1])
+            children = [child for child in self.tree.children(selected_node) 
+                        if self.tree.color[child] != self.search_board.get_color(self.other_player)]
+            if self.rollouts_per_child > 1:
+                # Simulating all the children's games in one batch and backpropagating the totals
+                wins, score_values = self.timed("simulate", self.simulate_batch, self.search_board, 
+                                                self.tree.color[children])
+                for child, win_total, score_total in zip(children, wins, score_values):
+                    self.timed("backpropagate", self.backpropagate, child, win_total, score_total, 
+                               self.rollouts_per_child, self.search_board.hash_after(self.player, self.tree.color[child]))
+            else:
+                # Making each child's move on the search board, simulating and then taking it back
+                for child in children:
+                    self.search_board.push_move(self.player, self.tree.color[child])
+                    position_key = self.search_board.zobrist_hash
+                    simulation_results = self.timed("simulate", self.simulate, self.search_board)
+                    self.search_board.pop_move()
+                    self.timed("backpropagate", self.backpropagate, child, simulation_results[0], 
+                               simulation_results[1], position_key = position_key)
+        return iteration
+
+
+    # Root parallelization: each worker process runs an independent search from a copy of this tree
+    # with its own seed. Their root statistics are then added to this tree's root in worker order,
+    # so the merged result only depends on the seed and the number of workers. Returns the total
+    # number of iterations run.
+    # With a deadline every worker searches until it passes (and its share of num_iterations if given).
+    # With early_stopping every worker also stops once the best move is decided in its own tree.
+    # Only the root and its children get the workers' statistics, the workers' deeper nodes are discarded.
+    # So below the root's children this tree only has its own statistics, and after advance the new 
+    # root's visit count is larger than its children's add up to. This only makes UCT explore the new 
+    # root's children a bit more until their own visits catch up.
+    def run_parallel_iterations(self, num_iterations, workers, seed_value, deadline = None, early_stopping = False):
+        if num_iterations is None:
+            iterations_per_worker = [None] * workers
+        else:
+            iterations_per_worker = [num_iterations // workers + (1 if i < num_iterations % workers else 0) 
+                                     for i in range(workers)]
+        jobs = [(self, iterations, seed_value + i, deadline, early_stopping) 
+                for i, iterations in enumerate(iterations_per_worker)]
+        children = self.tree.children(self.root_node)
+        total_iterations = 0
+        for num_worker_iterations, root_visits, (num_visits, num_wins, score_value), profiler in get_worker_pool(
+                workers).map(search_worker, jobs):
+            total_iterations += num_worker_iterations
+            if self.profiler is not None:
+                self.profiler.merge(profiler)
+            self.tree.num_visits[self.root_node] += root_visits
+            self.tree.num_visits[children] += num_visits
+            self.tree.num_wins[children] += num_wins
+            self.tree.score_value[children] += score_value
+        return total_iterations
+
+
+    # Moves the search forward by one turn (our move and the opponent's reply) and keeps the statistics
+    # of the subtree under our move. Opponent replies are sampled during selection rather than stored 
+    # as nodes, so the node for our move becomes the new root and its children are our next moves.
+    def advance(self, my_move, opponent_move):
+        self.game_board.update_board(self.player, my_move)
+        self.game_board.update_board(self.other_player, opponent_move)
+        self.game_board.copy_into(self.search_board)
+        
+        # Re-rooting at the child of the move that was played, creating it if it was never expanded.
+        # Only the new root's subtree is copied into the new tree. (After a parallel search the subtree
+        # lacks the workers' statistics, see run_parallel_iterations.)
+        new_root = self.root_child(my_move)
+        self.ponder_move = None
+        if new_root is None:
+            self.tree = NodePool(max_nodes = self.tree.max_nodes)
+            self.root_node = self.tree.add_root(my_move)
+        else:
+            self.tree = self.tree.extract_subtree(new_root)
+            self.root_node = 0
+        
+        if self.tree.num_children[self.root_node] == 0:
+            self.tree.add_children(self.root_node, self.game_board.legal_moves())
+
+
+    # Returns the root's child for the given move, or None if it has none
+    def root_child(self, move):
+        for child in self.tree.children(self.root_node):
+            if self.tree.color[child] == move:
+                return child
+        return None
+
+
+    # Starts pondering on the opponent's turn after our move was chosen: the iterations run from then on
+    # only search the subtree under my_move, which advance keeps once the opponent's move is known
+    def ponder(self, my_move):
+        if my_move not in self.game_board.legal_moves():
+            raise Exception("Pondering on an illegal move")
+        self.ponder_move = my_move
+
+
+    # Returns the legal children of the root. A reused root can also have a child for the opponent's 
+    # current color, which isn't a legal move.
+    def legal_root_children(self):
+        return [child for child in self.tree.children(self.root_node) 
+                if self.tree.color[child] != self.game_board.get_color(self.other_player)]
+
+
+    # Returns the number of simulations and average value ((wins + score_value) / visits) of each root 
+    # move as arrays indexed by color (zero for colors that aren't legal moves), e.g. for GameRecords
+    def root_statistics(self):
+        tree = self.tree
+        legal_children = self.legal_root_children()
+        visits = np.zeros(self.game_board.num_colors, dtype=np.int64)
+        values = np.zeros(self.game_board.num_colors)
+        colors = tree.color[legal_children]
+        visits[colors] = tree.num_visits[legal_children] - 1
+        values[colors] = (tree.num_wins[legal_children] + tree.score_value[legal_children]) / tree.num_visits[legal_children]
+        return visits, values
+
+
+    # Returns Hoeffding confidence bounds (lower, upper) at the given confidence level on the average of
+    # a statistic bounded by value_range for each of the given nodes
+    def confidence_bounds(self, nodes, totals, value_range):
+        num_simulations = np.maximum(self.tree.num_visits[nodes] - 1, 1)
+        means = totals / self.tree.num_visits[nodes]
+        radius = value_range * np.sqrt(log(2 / (1 - self.confidence)) / (2 * num_simulations))
+        return means - radius, means + radius
+
+
+    # Whether the game's outcome is decided: every legal root child's win rate is confidently above 
+    # one half (or every one is confidently below it)
+    def game_is_decided(self, legal_children):
+        win_lower, win_upper = self.confidence_bounds(legal_children, self.tree.num_wins[legal_children], 1)
+        return (win_lower > 0.5).all() or (win_upper < 0.5).all()
+
+
+    # Whether more iterations can't change the move: either the lower confidence bound on the value 
+    # (wins + score_value, between 0 and 2) of the leading root child is above the upper bounds of all
+    # the other children so none can overtake it, or the game's outcome is decided.
+    def is_decided(self):
+        legal_children = self.legal_root_children()
+        if len(legal_children) < 2 or self.game_is_decided(legal_children):
+            return True
+        tree = self.tree
+        lower, upper = self.confidence_bounds(legal_children, tree.num_wins[legal_children] + 
+                                              tree.score_value[legal_children], 2)
+        best = np.argmax(tree.num_wins[legal_children] + tree.score_value[legal_children]) 
+        return lower[best] > np.delete(upper, best).max()
+    
+    
+    # Returning the final best move after running the MCTS algorithm. The search runs num_iterations
+    # iterations, or with a time_limit (in seconds) until the time is up or max_iterations have been run,
+    # always returning the best move found so far. It stops early once the best move is decided (see
+    # is_decided) unless early_stopping is False. The time_limit includes any endgame solving.
+    # With workers > 1 the iterations are split across that many processes (see 
+    # run_parallel_iterations). The seed makes parallel searches reproducible.
+    # Once few enough cells are left (see endgame_cells) the move is found by solving the rest of the
+    # game exactly instead, without searching.
+    # With return_report, the time and calls of each step of the search are recorded and a report of 
+    # them is returned with the move (see search_report). It is also kept in last_report.
+    def select_move(self, num_iterations = 100, verbose = False, workers = 1, seed = None, 
+                    time_limit = None, max_iterations = None, early_stopping = True, return_report = False):
+        if not return_report:
+            return self.find_move(num_iterations, verbose, workers, seed, time_limit, max_iterations, early_stopping)
+        self.profiler = Profiler()
+        try:
+            move = self.find_move(num_iterations, verbose, workers, seed, time_limit, max_iterations, early_stopping)
+            self.last_report = self.search_report()
+        finally:
+            self.profiler = None
+        return move, self.last_report
+
+
+    # Finds the move for select_move
+    def find_move(self, num_iterations, verbose, workers, seed, time_limit, max_iterations, early_stopping):
+        self.last_solution = None
+        board_size = self.game_board.size[0] * self.game_board.size[1]
+        num_uncaptured = board_size - sum(self.game_board.get_score())
+        if num_uncaptured == 0:
+            # The game is over so no move matters, but callers still expect a legal one
+            self.last_num_iterations = 0
+            return self.game_board.greedy_move(self.player)
+
+        deadline = None
+        if time_limit is not None:
+            deadline = time() + time_limit
+            num_iterations = max_iterations
+        elif max_iterations is not None:
+            num_iterations = max_iterations
+
+        if self.endgame_cells is not None and num_uncaptured <= self.endgame_cells:
+            start_time = perf_counter()
+            solver = EndgameSolver(self.game_board, self.endgame_node_budget, deadline=deadline)
+            self.last_solution = solver.solve(self.player)
+            if self.profiler is not None:
+                self.profiler.record("endgame", start_time)
+                self.profiler.add_count("endgame_positions", solver.num_nodes)
+            if self.last_solution is not None:
+                self.last_num_iterations = 0
+                if verbose:
+                    print(f"{get_color_name(self.last_solution[0])} solved with a final score margin of {self.last_solution[1]}")
+                return self.last_solution[0]
+        
+        if workers > 1:
+            if seed is None:
+                seed = np.random.randint(2**31 - workers)
+            self.last_num_iterations = self.run_parallel_iterations(num_iterations, workers, seed, deadline, 
+                                                                    early_stopping)
+        else:
+            self.last_num_iterations = self.run_iterations(num_iterations, deadline, early_stopping)
 
         # Returning the child of the root node with the highest weight
-        move_scores = np.zeros(4)
-        for inx, child in enumerate(self.root_node.children):
-            move_scores[inx] = (child.num_wins + child.score_value) / child.num_visits
+        tree = self.tree
+        legal_children = self.legal_root_children()
+        move_scores = np.zeros(len(legal_children))
+        for inx, child in enumerate(legal_children):
+            move_scores[inx] = (tree.num_wins[child] + tree.score_value[child]) / tree.num_visits[child]
             if verbose:
                 size_scale = self.game_board.size[0] * self.game_board.size[1]
-                print(f"{get_color_name(child.color)} has win percentage {child.num_wins / child.num_visits}" + 
-                f" with an average score of {child.score_value / child.num_visits * size_scale}")
+                print(f"{get_color_name(tree.color[child])} has win percentage {tree.num_wins[child] / tree.num_visits[child]}" + 
+                f" with an average score of {tree.score_value[child] / tree.num_visits[child] * size_scale}")
 
-        # Keeping algorithm from just choosing randomly once it's sure it's gonna win or lose
-        if np.std(move_scores) < 0.05:
-            return self.game_board.greedy_move(self.player)
+        # Keeping algorithm from just choosing randomly once it's sure it's gonna win or lose. If every 
+        # child's win rate is confidently above (or below) one half, the children whose values can't be
+        # told apart from the best one are equally good, so the greedy move among them is chosen.
+        # Otherwise the AI could keep picking moves that don't fill in its territory and never finish.
+        best = np.argmax(move_scores)
+        if self.game_is_decided(legal_children):
+            lower, upper = self.confidence_bounds(legal_children, tree.num_wins[legal_children] + 
+                                                  tree.score_value[legal_children], 2)
+            candidates = tree.color[legal_children][upper >= lower[best]]
+            num_captured = np.array(self.game_board.get_frontier_counts(self.player))[candidates]
+            return np.random.choice(candidates[num_captured == num_captured.max()])
         else:
-            return self.root_node.children[np.argmax(move_scores)].color
+            return tree.color[legal_children[best]]
+
 
+    
+    # Returns the report of the search recorded by the profiler: the time and calls of each step, the
+    # simulated games, the size of the tree and transposition table, and the number of board deep copies
+    # made since the MCTS was created. After a parallel search the tree and table are this process's own,
+    # since the workers' copies are discarded.
+    def search_report(self):
+        report = self.profiler.report()
+        report["iterations"] = self.last_num_iterations
+        report["endgame_solved"] = self.last_solution is not None
+        report["tree"] = {
+            "nodes": self.tree.size,
+            "max_depth": self.tree.max_depth(self.root_node),
+            "memory_bytes": self.tree.memory_usage(),
+        }
+        report["transposition_table"] = None
+        if self.transposition_table is not None:
+            report["transposition_table"] = self.transposition_table.get_stats()
+        report["board_copies"] = self.num_board_copies
+        return report
+
+
+# Process pools shared by all parallel searches, by number of workers
+worker_pools = {}
+
+def get_worker_pool(workers):
+    if workers not in worker_pools:
+        worker_pools[workers] = Pool(workers)
+    return worker_pools[workers]
+
+
+# Runs one worker's share of a parallel search and returns the number of iterations it ran, how much 
+# the root's visits and the root children's visits, wins and score_values grew, and its profiler (if
+# a report is being recorded, holding only this worker's search)
+def search_worker(job):
+    mcts, num_iterations, seed_value, deadline, early_stopping = job
+    random_seed(seed_value)
+    np.random.seed(seed_value)
+    if mcts.profiler is not None:
+        mcts.profiler = Profiler() # Only this worker's records, the parent's are already in its own
+    
+    tree = mcts.tree
+    children = tree.children(mcts.root_node)
+    root_visits = tree.num_visits[mcts.root_node]
+    child_stats = (tree.num_visits[children].copy(), tree.num_wins[children].copy(), tree.score_value[children].copy())
+    num_iterations = mcts.run_iterations(num_iterations, deadline, early_stopping)
+    return (num_iterations, tree.num_visits[mcts.root_node] - root_visits, 
+            (tree.num_visits[children] - child_stats[0], tree.num_wins[children] - child_stats[1], 
+             tree.score_value[children] - child_stats[2]), mcts.profiler)
 
 
 # Helper function for the verbose printout
@@ -189,4 +571,5 @@ def get_color_name(color_number):
     if color_number == 4:
         return "purple"
     if color_number == 5:
-        return "black"
\ No newline at end of file
+        return "black"
+    return f"color {color_number}"
\ No newline at end of file
@@ -0,0 +1,168 @@
+import numpy as np
+from math import log
+
+"""
+NodePool Class: Stores the MCTS search tree as preallocated NumPy arrays (a struct of arrays) instead
+of one Python object per node. A node is an index into the arrays. The children of a node are always
+added together, so they are stored next to each other and found from first_child and num_children.
+The arrays grow by chunk_size nodes at a time, and max_nodes bounds the memory used by the tree.
+Takes in the following parameters:
+    - chunk_size: Number of nodes the arrays grow by when they are full
+    - max_nodes: Maximum number of nodes the pool can hold (None for no limit)
+"""
+class NodePool:
+    # Per node arrays and their types. num_visits starts at 1 for every node.
+    fields = [("num_visits", np.int64), ("num_wins", np.float64), ("score_value", np.float64),
+              ("color", np.int8), ("num_children", np.int8), ("parent", np.int32), ("first_child", np.int32)]
+    max_colors = np.iinfo(np.int8).max + 1 # Colors 0 to max_colors - 1 fit in the color field
+
+    def __init__(self, chunk_size = 4096, max_nodes = None):
+        self.chunk_size = chunk_size
+        self.max_nodes = max_nodes
+        self.size = 0
+        self.capacity = 0
+        for name, dtype in self.fields:
+            setattr(self, name, np.zeros(0, dtype=dtype))
+        self.grow(chunk_size)
+
+
+    # Number of bytes each node takes up in the arrays
+    @classmethod
+    def bytes_per_node(cls):
+        return sum(np.dtype(dtype).itemsize for _, dtype in cls.fields)
+
+
+    # Number of bytes allocated for the arrays (including the unused part of the last chunk)
+    def memory_usage(self):
+        return self.capacity * self.bytes_per_node()
+
+
+    # Makes room for at least num_nodes more nodes
+    def grow(self, num_nodes):
+        new_capacity = self.capacity + max(num_nodes, self.chunk_size)
+        for name, dtype in self.fields:
+            array = np.zeros(new_capacity, dtype=dtype)
+            array[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, array)
+        self.capacity = new_capacity
+
+
+    # Whether num_nodes more nodes fit within max_nodes
+    def has_room(self, num_nodes):
+        return self.max_nodes is None or self.size + num_nodes <= self.max_nodes
+
+
+    # Adds num_nodes new nodes with the given colors and parent and returns the index of the first one
+    def allocate(self, colors, parent):
+        num_nodes = len(colors)
+        if self.size + num_nodes > self.capacity:
+            self.grow(num_nodes)
+        first = self.size
+        new_nodes = slice(first, first + num_nodes)
+        self.num_visits[new_nodes] = 1
+        self.num_wins[new_nodes] = 0
+        self.score_value[new_nodes] = 0
+        self.color[new_nodes] = colors
+        self.num_children[new_nodes] = 0
+        self.parent[new_nodes] = parent
+        self.first_child[new_nodes] = -1
+        self.size += num_nodes
+        return first
+
+
+    # Adds a root node (a node without a parent) and returns its index
+    def add_root(self, color):
+        return self.allocate([color], -1)
+
+
+    # Adds the children of a node with the given colors
+    def add_children(self, node, colors):
+        self.first_child[node] = self.allocate(colors, node)
+        self.num_children[node] = len(colors)
+
+
+    # Returns the indices of a node's children
+    def children(self, node):
+        first = self.first_child[node]
+        return range(first, first + self.num_children[node])
+
+
+    # Returns the nodes from the given node up to the root
+    def path_to_root(self, node):
+        path = []
+        while node != -1:
+            path.append(node)
+            node = self.parent[node]
+        return path
+
+
+    # Returns the children of all the given nodes, in order
+    def next_level(self, level):
+        counts = self.num_children[level].astype(np.int64)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(self.first_child[level], counts) + offsets
+
+
+    # Returns the number of levels below the given node (0 if it has no children)
+    def max_depth(self, node):
+        level = self.next_level(np.array([node]))
+        depth = 0
+        while len(level) > 0:
+            level = self.next_level(level)
+            depth += 1
+        return depth
+
+
+    # Adds the results of num_simulations simulated games to a node and all of its ancestors
+    def backpropagate(self, node, win_loss, score_value, num_simulations = 1):
+        path = self.path_to_root(node)
+        self.num_visits[path] += num_simulations
+        self.num_wins[path] += win_loss
+        self.score_value[path] += score_value
+
+
+    # Returns the average value ((wins + score_value) / visits) of each child of a node
+    def child_values(self, node):
+        children = slice(self.first_child[node], self.first_child[node] + self.num_children[node])
+        return (self.num_wins[children] + self.score_value[children]) / self.num_visits[children]
+
+
+    # Returns the child of a node with the highest UCT weight, computed for all children at once.
+    # Children with the excluded color are never chosen. values can replace the children's own averages.
+    def select_child(self, node, exploration_parameter, excluded_color, values = None):
+        first = int(self.first_child[node])
+        children = slice(first, first + int(self.num_children[node]))
+        visits = self.num_visits[children]
+        if values is None:
+            values = (self.num_wins[children] + self.score_value[children]) / visits
+        weights = values + exploration_parameter * np.sqrt(log(self.num_visits[node]) / visits)
+        weights[self.color[children] == excluded_color] = -np.inf
+
+        # Taking the last of the best children to break ties like the original object tree did
+        return children.stop - 1 - int(np.argmax(weights[::-1]))
+
+
+    # Returns a new pool holding only the subtree under the given node, with that node as its root.
+    # Nodes are copied level by level so each node's children stay next to each other.
+    def extract_subtree(self, node):
+        levels = [np.array([node])]
+        while True:
+            level = self.next_level(levels[-1])
+            if len(level) == 0:
+                break
+            levels.append(level)
+        order = np.concatenate(levels)
+
+        # Old node index -> new node index
+        new_index = np.full(self.size + 1, -1, dtype=np.int32)
+        new_index[order] = np.arange(len(order))
+
+        subtree = NodePool(self.chunk_size, self.max_nodes)
+        subtree.grow(len(order))
+        for name, _ in self.fields:
+            getattr(subtree, name)[:len(order)] = getattr(self, name)[order]
+        subtree.parent[:len(order)] = new_index[subtree.parent[:len(order)]] # -1 maps to -1 via the extra entry
+        subtree.parent[0] = -1
+        subtree.first_child[:len(order)] = new_index[subtree.first_child[:len(order)]]
+        subtree.size = len(order)
+        return subtree
@@ -0,0 +1,62 @@
+from time import perf_counter
+
+"""
+Profiler Class: Records the time spent in and the number of calls to each phase of an MCTS search
+(select, expand, simulate, backpropagate, the opponent model's best_move_depth calls and endgame
+solving), the number and length of the simulated games, and other named counts. MCTS only creates one
+when a report is asked for (see MCTS.select_move), so searches without one only pay for checking that
+it is None.
+"""
+class Profiler:
+    def __init__(self):
+        self.start_time = perf_counter()
+        self.calls = {}
+        self.seconds = {}
+        self.num_rollouts = 0
+        self.num_rollout_moves = 0
+        self.counts = {}
+
+
+    # Adds a call to the given phase that started at start_time (a perf_counter() value)
+    def record(self, phase, start_time):
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + perf_counter() - start_time
+
+
+    # Adds num_rollouts simulated games with num_moves moves between them
+    def add_rollouts(self, num_rollouts, num_moves):
+        self.num_rollouts += num_rollouts
+        self.num_rollout_moves += num_moves
+
+
+    # Adds to a named count (e.g. the positions searched by the endgame solver)
+    def add_count(self, name, value):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+
+    # Adds the counts of another profiler (e.g. from a worker process of a parallel search)
+    def merge(self, profiler):
+        for phase, calls in profiler.calls.items():
+            self.calls[phase] = self.calls.get(phase, 0) + calls
+            self.seconds[phase] = self.seconds.get(phase, 0.0) + profiler.seconds[phase]
+        self.num_rollouts += profiler.num_rollouts
+        self.num_rollout_moves += profiler.num_rollout_moves
+        for name, value in profiler.counts.items():
+            self.add_count(name, value)
+
+
+    # Returns the recorded counts as a dictionary. Times of parallel workers add up, so they can be
+    # larger than the total time.
+    def report(self):
+        simulate_seconds = self.seconds.get("simulate", 0.0)
+        return {
+            "total_seconds": perf_counter() - self.start_time,
+            "phases": {phase: {"calls": self.calls[phase], "seconds": self.seconds[phase]} for phase in self.calls},
+            "rollouts": {
+                "count": self.num_rollouts,
+                "moves": self.num_rollout_moves,
+                "average_length": self.num_rollout_moves / self.num_rollouts if self.num_rollouts > 0 else 0.0,
+                "per_second": self.num_rollouts / simulate_seconds if simulate_seconds > 0 else 0.0,
+            },
+            "counts": dict(self.counts),
+        }
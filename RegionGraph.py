@@ -0,0 +1,208 @@
+import numpy as np
+from random import choice
+
+"""
+RegionGraph Class: A Filler position compressed into a graph of regions, where a region is a connected
+group of uncaptured cells of the same color and each player's territory is a single region. Since a move
+always captures whole regions, a move is just "absorb every region of color c next to the territory" and
+no cells are touched after the graph is built. Sets of regions (territories, frontiers, regions of each
+color) are Python integers with bit r set for region r.
+Boards made by fix_board have no touching cells of the same color, so there every uncaptured region is a
+single cell. Boards from real games (Board(data=...)) can have larger regions and compress further.
+Takes in the following parameters:
+    - board: Board to build the graph from. Positions reached from it by later moves can be loaded with
+        set_position without building the graph again.
+"""
+class RegionGraph:
+    def __init__(self, board):
+        self.size = board.size
+        self.num_colors = board.num_colors
+        self.board_size = self.size[0] * self.size[1]
+
+        # Splitting the uncaptured cells into connected regions of one color. Regions 0 and 1 are the
+        # players' territories.
+        uncaptured = board.full_mask & ~(board.player_1_territory | board.player_2_territory)
+        region_masks = [board.player_1_territory, board.player_2_territory]
+        region_colors = [board.player_1_color, board.player_2_color]
+        for color, color_mask in enumerate(board.color_masks):
+            remaining = color_mask & uncaptured
+            while remaining:
+                region = remaining & -remaining
+                gained = region
+                while gained:
+                    gained = board.neighbors_mask(gained) & remaining & ~region
+                    region |= gained
+                remaining &= ~region
+                region_masks.append(region)
+                region_colors.append(color)
+        self.num_regions = len(region_masks)
+        self.region_sizes = [mask.bit_count() for mask in region_masks]
+        self.single_cells = max(self.region_sizes[2:], default=1) == 1
+
+        # Region of every cell, indexed by the cell's bit in the Board's bitboards
+        self.cell_regions = np.zeros(board.size[0] * board.stride, dtype=np.int32)
+        for region, mask in enumerate(region_masks):
+            self.cell_regions[self.mask_bits(mask)] = region
+
+        # Regions next to each region and the uncaptured regions of each color
+        self.region_neighbors = [self.regions_of(board.neighbors_mask(mask) & ~mask) for mask in region_masks]
+        self.color_regions = [0] * self.num_colors
+        for region in range(2, self.num_regions):
+            self.color_regions[region_colors[region]] |= 1 << region
+
+        self.set_position(board)
+
+
+    # Returns the bit indices of a bitboard
+    def mask_bits(self, mask):
+        num_bytes = (mask.bit_length() + 7) // 8
+        bits = np.unpackbits(np.frombuffer(mask.to_bytes(num_bytes, 'little'), dtype=np.uint8), bitorder='little')
+        return np.flatnonzero(bits)
+
+
+    # Converts a bitboard of cells into the set of regions containing those cells
+    def regions_of(self, mask):
+        regions = np.zeros(self.num_regions, dtype=bool)
+        regions[self.cell_regions[self.mask_bits(mask)]] = True
+        return int.from_bytes(np.packbits(regions, bitorder='little').tobytes(), 'little')
+
+
+    # Loads the position of a board. The board must be the one the graph was built from or a position
+    # reached from it by playing moves, so that its territories are made of whole regions.
+    def set_position(self, board):
+        self.player_1_territory = self.regions_of(board.player_1_territory)
+        self.player_2_territory = self.regions_of(board.player_2_territory)
+        self.player_1_frontier = self.regions_of(board.player_1_frontier)
+        self.player_2_frontier = self.regions_of(board.player_2_frontier)
+        self.player_1_color = board.player_1_color
+        self.player_2_color = board.player_2_color
+        self.player_1_score, self.player_2_score = board.get_score()
+
+
+    # Returns the game state so it can be restored later with set_state
+    def get_state(self):
+        return (self.player_1_territory, self.player_2_territory, self.player_1_frontier, self.player_2_frontier,
+                self.player_1_color, self.player_2_color, self.player_1_score, self.player_2_score)
+
+
+    # Restores a game state returned by get_state
+    def set_state(self, state):
+        (self.player_1_territory, self.player_2_territory, self.player_1_frontier, self.player_2_frontier,
+         self.player_1_color, self.player_2_color, self.player_1_score, self.player_2_score) = state
+
+
+    # Returns the current game score in cells
+    def get_score(self):
+        return (self.player_1_score, self.player_2_score)
+
+
+    # Returns what percentage of the board is captured
+    def get_percentage_done(self):
+        return (self.player_1_score + self.player_2_score) / self.board_size
+
+
+    # Returns the player color for a given player
+    def get_color(self, player_number):
+        if player_number == 1:
+            return self.player_1_color
+        elif player_number == 2:
+            return self.player_2_color
+        else:
+               raise Exception("Invalid player number")
+
+
+    # Returns the possible legal moves for the current position (the same moves as Board.legal_moves)
+    def legal_moves(self):
+        moves = list(range(self.num_colors))
+        moves.remove(self.player_1_color)
+        moves.remove(self.player_2_color)
+        return moves
+
+
+    # Returns the number of cells a player would capture with the given color
+    def gained_cells(self, player_number, color_value):
+        if player_number == 1:
+            gained = self.player_1_frontier & self.color_regions[color_value]
+        elif player_number == 2:
+            gained = self.player_2_frontier & self.color_regions[color_value]
+        else:
+               raise Exception("Invalid player number")
+        if self.single_cells:
+            return gained.bit_count()
+        num_cells = 0
+        while gained:
+            lowest_region = gained & -gained
+            num_cells += self.region_sizes[lowest_region.bit_length() - 1]
+            gained ^= lowest_region
+        return num_cells
+
+
+    # Returns a territory's new frontier and score after it absorbed the gained regions
+    def grow_frontier(self, frontier, score, gained, captured):
+        if self.single_cells:
+            score += gained.bit_count()
+        while gained:
+            lowest_region = gained & -gained
+            region = lowest_region.bit_length() - 1
+            frontier |= self.region_neighbors[region]
+            if not self.single_cells:
+                score += self.region_sizes[region]
+            gained ^= lowest_region
+        return frontier & ~captured, score
+
+
+    # Updates the position based on the given player and the color value
+    def update_board(self, player_number, color_value):
+        if player_number == 1:
+            if color_value == self.player_2_color:
+                raise Exception("Trying to choose the color of the other player")
+            if color_value == self.player_1_color:
+                raise Exception("Trying to choose your own color")
+
+            # Absorbing every frontier region of the chosen color
+            gained = self.player_1_frontier & self.color_regions[color_value]
+            self.player_1_territory |= gained
+            if gained:
+                self.player_1_frontier, self.player_1_score = self.grow_frontier(
+                    self.player_1_frontier, self.player_1_score, gained, self.player_1_territory | self.player_2_territory)
+                self.player_2_frontier &= ~gained
+            self.player_1_color = color_value
+
+        elif player_number == 2:
+            if color_value == self.player_1_color:
+                raise Exception("Trying to choose the color of the other player")
+            if color_value == self.player_2_color:
+                raise Exception("Trying to choose your own color")
+
+            # Absorbing every frontier region of the chosen color
+            gained = self.player_2_frontier & self.color_regions[color_value]
+            self.player_2_territory |= gained
+            if gained:
+                self.player_2_frontier, self.player_2_score = self.grow_frontier(
+                    self.player_2_frontier, self.player_2_score, gained, self.player_1_territory | self.player_2_territory)
+                self.player_1_frontier &= ~gained
+            self.player_2_color = color_value
+
+        else:
+               raise Exception("Invalid player number")
+
+
+    # Plays out a random game from the current position, starting with first_player, and returns the
+    # win/loss result and the final score (as a fraction of the board) for the given player. The current
+    # position is restored afterwards.
+    def simulate(self, player_number, first_player):
+        second_player = 1 if first_player == 2 else 2
+        state = self.get_state()
+
+        # Playing out the simulation
+        while self.player_1_score + self.player_2_score < self.board_size:
+            self.update_board(first_player, choice(self.legal_moves()))
+            self.update_board(second_player, choice(self.legal_moves()))
+
+        # Restoring the position and returning the result
+        score = self.get_score()
+        self.set_state(state)
+        if player_number == 1:
+            return (int(score[0] > score[1]), score[0] / self.board_size)
+        else:
+            return (int(score[1] > score[0]), score[1] / self.board_size)
@@ -0,0 +1,63 @@
+from SearchSession import SearchSession
+
+"""
+SearchService Class: Keeps a SearchSession per game, so a server can search for many games at once
+without one game's search blocking another's. Games are identified by any hashable game id.
+Takes in the following parameters:
+    - slice_iterations: Number of iterations each session's background thread runs at a time
+    - max_ponder_iterations: Maximum number of iterations each session runs while waiting for each 
+        opponent move (see SearchSession)
+    - mcts_parameters: Default MCTS parameters for new games (e.g. exploration_parameter)
+"""
+class SearchService:
+    def __init__(self, slice_iterations = 10, max_ponder_iterations = 10000, **mcts_parameters):
+        self.slice_iterations = slice_iterations
+        self.max_ponder_iterations = max_ponder_iterations
+        self.mcts_parameters = mcts_parameters
+        self.sessions = {}
+
+
+    # Starts searching for a game at the start of the AI's turn, replacing the game's previous session.
+    # mcts_parameters override the service's defaults.
+    def new_game(self, game_id, board, player, **mcts_parameters):
+        self.end_game(game_id)
+        self.sessions[game_id] = SearchSession(board, player, self.slice_iterations, self.max_ponder_iterations,
+                                               **{**self.mcts_parameters, **mcts_parameters})
+
+
+    # Returns a game's session
+    def get_session(self, game_id):
+        if game_id not in self.sessions:
+            raise Exception(f"No search for game {game_id}")
+        return self.sessions[game_id]
+
+
+    # Returns the AI's move for a game within time_limit seconds (see SearchSession.best_move)
+    def best_move(self, game_id, time_limit = 1.0, max_iterations = None):
+        return self.get_session(game_id).best_move(time_limit, max_iterations)
+
+
+    # Tells a game's session the opponent's move (see SearchSession.opponent_moved)
+    def opponent_moved(self, game_id, opponent_move):
+        self.get_session(game_id).opponent_moved(opponent_move)
+
+
+    # Stops searching for a game
+    def end_game(self, game_id):
+        session = self.sessions.pop(game_id, None)
+        if session is not None:
+            session.close()
+
+
+    # Stops searching for every game
+    def close(self):
+        for game_id in list(self.sessions):
+            self.end_game(game_id)
+
+
+    # asyncio versions of best_move and opponent_moved
+    async def best_move_async(self, game_id, time_limit = 1.0, max_iterations = None):
+        return await self.get_session(game_id).best_move_async(time_limit, max_iterations)
+
+    async def opponent_moved_async(self, game_id, opponent_move):
+        await self.get_session(game_id).opponent_moved_async(opponent_move)
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+from time import time, sleep
+from MCTS import MCTS
+
+"""
+SearchSession Class: Runs the MCTS search for one game in a background thread, so a server can ask for
+a move without searching inside its request handler. The search runs on the AI's turn and keeps running
+(pondering) on the opponent's turn under the move the AI played, and once the opponent's move is known
+the matching subtree is kept (see MCTS.ponder and MCTS.advance). The thread searches slice_iterations
+iterations at a time and only holds the session's lock during a slice, so requests wait at most one
+slice. Every blocking method has an asyncio version that runs it in a worker thread.
+Threads share Python's interpreter lock, so sessions searching at the same time take turns instead of
+running in parallel; none of them blocks the others or the event loop though.
+Takes in the following parameters:
+    - board: The board at the start of the AI's turn
+    - player: The player the AI plays as
+    - slice_iterations: Number of iterations the background thread runs at a time
+    - max_ponder_iterations: Maximum number of iterations run while waiting for each opponent move, so
+        a game that is abandoned without calling close doesn't keep a core busy (None for no limit)
+    - mcts_parameters: Parameters passed on to MCTS (e.g. exploration_parameter)
+"""
+class SearchSession:
+    def __init__(self, board, player, slice_iterations = 10, max_ponder_iterations = 10000, **mcts_parameters):
+        self.mcts = MCTS(board, player, **mcts_parameters)
+        self.slice_iterations = slice_iterations
+        self.max_ponder_iterations = max_ponder_iterations
+        self.my_move = None # The AI's move while waiting for the opponent's
+        self.num_ponder_iterations = 0 # Iterations run since my_move was chosen
+        self.lock = threading.Lock()
+        self.running = threading.Event()
+        self.request_waiting = threading.Event() # Set while a request waits for the lock
+        self.closed = False
+        self.thread = threading.Thread(target=self.search_loop, daemon=True)
+        self.thread.start()
+        self.running.set()
+
+
+    # Whether the background thread has something left to search: the game isn't at the point where the
+    # endgame solver takes over (or over) and, on the AI's turn, the best move isn't decided yet or, on
+    # the opponent's turn, pondering hasn't run max_ponder_iterations yet
+    def needs_search(self):
+        board = self.mcts.game_board
+        num_uncaptured = board.size[0] * board.size[1] - sum(board.get_score())
+        if num_uncaptured == 0 or (self.mcts.endgame_cells is not None and num_uncaptured <= self.mcts.endgame_cells):
+            return False
+        if self.my_move is not None:
+            return self.max_ponder_iterations is None or self.num_ponder_iterations < self.max_ponder_iterations
+        return not self.mcts.is_decided()
+
+
+    # Background thread: searches one slice at a time while the session is running. closed is checked
+    # again under the lock, since close sets it (and wakes the thread) under the lock too, so the thread
+    # can't go back to sleep after missing it.
+    def search_loop(self):
+        while True:
+            self.running.wait()
+            if self.closed:
+                return
+            if self.request_waiting.is_set():
+                sleep(0.001) # Letting the request take the lock first
+                continue
+            with self.lock:
+                if self.closed:
+                    return
+                if self.needs_search():
+                    num_iterations = self.mcts.run_iterations(self.slice_iterations)
+                    if self.my_move is not None:
+                        self.num_ponder_iterations += num_iterations
+                else:
+                    self.running.clear() # Nothing to search until the next move
+
+
+    # Takes the session's lock ahead of the background thread
+    def acquire(self):
+        self.request_waiting.set()
+        self.lock.acquire()
+        self.request_waiting.clear()
+
+
+    # Returns the AI's move, searching until time_limit seconds have passed or max_iterations more 
+    # iterations have run (less if the move is decided sooner), including any endgame solving. The 
+    # iterations already run in the background count too. The AI then ponders on the opponent's turn until opponent_moved is called.
+    # If the game is already over, a legal move is returned right away and there is nothing to ponder.
+    def best_move(self, time_limit = 1.0, max_iterations = None):
+        if self.my_move is not None:
+            raise Exception("Waiting for the opponent's move")
+        deadline = time() + time_limit
+        self.acquire()
+        try:
+            board = self.mcts.game_board
+            if sum(board.get_score()) == board.size[0] * board.size[1]:
+                return self.mcts.select_move(num_iterations=0)
+            # Near the end of the game select_move solves the endgame, so searching first would be wasted.
+            # The solver gets whatever time is left.
+            if self.needs_search():
+                self.mcts.run_iterations(max_iterations, deadline, early_stopping=True)
+            self.my_move = self.mcts.select_move(time_limit=max(0.0, deadline - time()), max_iterations=0)
+            self.mcts.ponder(self.my_move)
+            self.num_ponder_iterations = 0
+            self.running.set()
+        finally:
+            self.lock.release()
+        return self.my_move
+
+
+    # Tells the session the opponent's move, keeping the search tree under the AI's move and the
+    # opponent's reply. The AI's next move is then searched in the background.
+    def opponent_moved(self, opponent_move):
+        if self.my_move is None:
+            raise Exception("The AI hasn't moved yet")
+        self.acquire()
+        try:
+            self.mcts.advance(self.my_move, opponent_move)
+            self.my_move = None
+            self.running.set()
+        finally:
+            self.lock.release()
+
+
+    # Stops the background thread, waiting at most timeout seconds for it to finish its slice. Returns
+    # whether it stopped (it is a daemon thread, so one that didn't can't keep the process running).
+    def close(self, timeout = 5.0):
+        self.acquire()
+        try:
+            self.closed = True
+            self.running.set()
+        finally:
+            self.lock.release()
+        self.thread.join(timeout)
+        return not self.thread.is_alive()
+
+
+    # asyncio versions of best_move and opponent_moved, running them in a worker thread
+    async def best_move_async(self, time_limit = 1.0, max_iterations = None):
+        return await asyncio.to_thread(self.best_move, time_limit, max_iterations)
+
+    async def opponent_moved_async(self, opponent_move):
+        await asyncio.to_thread(self.opponent_moved, opponent_move)
@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+import numpy as np
+from random import seed as random_seed
+from itertools import product
+from multiprocessing import Pool
+from statistics import NormalDist
+from time import perf_counter
+from Board import Board
+from MCTS import MCTS
+from GameRecords import GameRecords
+
+"""
+Tournament Class: Plays games between the MCTS AI and simple opponents for every configuration in a grid
+of MCTS parameters and opponents, in a bounded pool of worker processes. Every finished game is appended
+to a JSONL file right away, so an interrupted tournament resumes where it stopped by skipping the games
+already in the file. Game number i of every configuration is played on the same board (seeded from the
+tournament seed and i), so configurations are compared on the same boards.
+Opponents are "greedy" (Board.greedy_move) or "depth<d>" (Board.best_move_depth with depth d).
+Takes in the following parameters:
+    - results_path: JSONL file the game results are appended to
+    - size: Board size
+    - num_games: Number of games played for each configuration
+    - num_iterations, exploration_parameters, intelligence_parameters: Lists of MCTS parameters to sweep
+    - opponents: List of opponents to play against
+    - ai_first: List of whether the AI moves first ([True, False] to play both sides)
+    - seed: Seed the boards and searches are generated from
+    - records_path: If given, every game's board and moves are also appended to this GameRecords file,
+        and each result stores the game's index in it as "record". The file should only hold this 
+        tournament's games, since a resumed run drops the records after the last one a result refers to
+        (games whose result wasn't written before a run was killed).
+    - record_stats: Whether the game records also store the AI's MCTS root statistics for each move
+Run from the command line, e.g.
+    python Tournament.py --games 100 --iterations 50 100 500 --opponents greedy depth1 depth3
+"""
+class Tournament:
+    def __init__(self, results_path, size = (7,8), num_games = 100, num_iterations = (100,),
+                 exploration_parameters = (2,), intelligence_parameters = (0.5,), opponents = ("greedy",),
+                 ai_first = (True, False), seed = 0, records_path = None, record_stats = False):
+        self.results_path = results_path
+        self.records = None
+        if records_path is not None:
+            self.records = GameRecords(records_path, size, root_stats=record_stats)
+        self.size = tuple(size)
+        self.num_games = num_games
+        self.seed = seed
+        for opponent in opponents:
+            if opponent != "greedy" and not (opponent.startswith("depth") and opponent[5:].isdigit()):
+                raise Exception(f"Invalid opponent {opponent}")
+        self.configurations = [
+            {"size": list(self.size), "num_iterations": iterations, "exploration_parameter": exploration,
+             "intelligence_parameter": intelligence, "opponent": opponent, "ai_first": first}
+            for iterations, exploration, intelligence, opponent, first in product(
+                num_iterations, exploration_parameters, intelligence_parameters, opponents, ai_first)]
+
+
+    # Returns the results stored in the results file so far. A line cut off by killing a run is skipped
+    # (its game is played again).
+    def load_results(self):
+        if not os.path.exists(self.results_path):
+            return []
+        results = []
+        with open(self.results_path) as results_file:
+            for line in results_file:
+                try:
+                    results.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return results
+
+
+    # Returns the (configuration, game number, seed) of every game that isn't in the results file yet
+    def pending_games(self):
+        finished = {(configuration_key(result["configuration"]), result["game"], result["seed"])
+                    for result in self.load_results()}
+        record_stats = self.records is not None and self.records.root_stats
+        return [(configuration, game, self.seed, record_stats) for configuration in self.configurations
+                for game in range(self.num_games)
+                if (configuration_key(configuration), game, self.seed) not in finished]
+
+
+    # Plays every pending game on the given number of worker processes, appending each result to the
+    # results file as soon as it finishes. Returns the number of games played.
+    def run(self, workers = None, verbose = False):
+        games = self.pending_games()
+        if len(games) == 0:
+            return 0
+        if self.records is not None:
+            recorded = [result["record"] for result in self.load_results() if "record" in result]
+            self.records.truncate(max(recorded) + 1 if len(recorded) > 0 else 0)
+        with Pool(workers or os.cpu_count()) as pool, open(self.results_path, "a+") as results_file:
+            # Starting on a new line if the last run was killed while writing a result
+            if results_file.tell() > 0:
+                results_file.seek(results_file.tell() - 1)
+                if results_file.read(1) != "\n":
+                    results_file.write("\n")
+            for num_played, (result, record) in enumerate(pool.imap_unordered(play_game, games), 1):
+                if self.records is not None:
+                    result["record"] = len(self.records)
+                    self.records.append(*record)
+                results_file.write(json.dumps(result) + "\n")
+                results_file.flush()
+                if verbose:
+                    print(f"{num_played}/{len(games)} games played", end="\r")
+        if verbose:
+            print()
+        return len(games)
+
+
+    # Returns a summary of each configuration's results (games, wins, losses, ties, win rate with its
+    # Wilson score interval at the given confidence, average scores and the AI's seconds per move)
+    def report(self, confidence = 0.95):
+        results = {}
+        for result in self.load_results():
+            if result["seed"] == self.seed:
+                results.setdefault(configuration_key(result["configuration"]), []).append(result)
+        summaries = []
+        for configuration in self.configurations:
+            games = results.get(configuration_key(configuration), [])
+            if len(games) == 0:
+                continue
+            ai_scores = np.array([game["ai_score"] for game in games])
+            opponent_scores = np.array([game["opponent_score"] for game in games])
+            wins = int((ai_scores > opponent_scores).sum())
+            lower, upper = wilson_interval(wins, len(games), confidence)
+            summaries.append({
+                "configuration": configuration,
+                "games": len(games),
+                "wins": wins,
+                "losses": int((ai_scores < opponent_scores).sum()),
+                "ties": int((ai_scores == opponent_scores).sum()),
+                "win_rate": wins / len(games),
+                "win_rate_interval": (lower, upper),
+                "ai_score": ai_scores.mean(),
+                "opponent_score": opponent_scores.mean(),
+                "seconds_per_move": sum(game["ai_seconds"] for game in games) / sum(game["ai_moves"] for game in games),
+            })
+        return summaries
+
+
+    # Prints the report as a table
+    def print_report(self, confidence = 0.95):
+        print(f"{'iterations':>10} {'explore':>8} {'intel':>6} {'opponent':>9} {'first':>6} {'games':>6}" +
+              f" {'win rate':>9} {f'{confidence:.0%} interval':>15} {'ai score':>9} {'opp score':>10} {'s/move':>8}")
+        for summary in self.report(confidence):
+            configuration = summary["configuration"]
+            lower, upper = summary["win_rate_interval"]
+            print(f"{configuration['num_iterations']:>10} {configuration['exploration_parameter']:>8}" +
+                  f" {configuration['intelligence_parameter']:>6} {configuration['opponent']:>9}" +
+                  f" {str(configuration['ai_first']):>6} {summary['games']:>6} {summary['win_rate']:>9.3f}" +
+                  f" {f'[{lower:.3f}, {upper:.3f}]':>15} {summary['ai_score']:>9.1f} {summary['opponent_score']:>10.1f}" +
+                  f" {summary['seconds_per_move']:>8.4f}")
+
+
+
+# Key identifying a configuration in the results file
+def configuration_key(configuration):
+    return json.dumps(configuration, sort_keys=True)
+
+
+# Returns the Wilson score interval for a win rate of wins out of num_games at the given confidence
+def wilson_interval(wins, num_games, confidence = 0.95):
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    rate = wins / num_games
+    center = (rate + z**2 / (2 * num_games)) / (1 + z**2 / num_games)
+    radius = z * np.sqrt(rate * (1 - rate) / num_games + z**2 / (4 * num_games**2)) / (1 + z**2 / num_games)
+    return max(center - radius, 0.0), min(center + radius, 1.0)
+
+
+# Plays one tournament game in a worker process and returns its result and its game record (the starting
+# board, the moves and the AI's root statistics if record_stats is set). The board and the searches are
+# seeded from the tournament seed and the game number.
+def play_game(game):
+    configuration, game_number, seed_value, record_stats = game
+    game_seed = (seed_value * 1000003 + game_number) % 2**32
+    random_seed(game_seed)
+    np.random.seed(game_seed)
+    board = Board(size=tuple(configuration["size"]))
+    board_data = board.data.copy()
+    moves = []
+    stats = []
+
+    ai_player = 1 if configuration["ai_first"] else 2
+    opponent_player = 1 if ai_player == 2 else 2
+    opponent = configuration["opponent"]
+    board_size = board.size[0] * board.size[1]
+    ai_seconds = 0
+    ai_moves = 0
+    player = 1
+    while sum(board.get_score()) < board_size:
+        if player == ai_player:
+            start_time = perf_counter()
+            mcts = MCTS(board, ai_player, exploration_parameter = configuration["exploration_parameter"],
+                        intelligence_parameter = configuration["intelligence_parameter"])
+            move = mcts.select_move(num_iterations = configuration["num_iterations"])
+            ai_seconds += perf_counter() - start_time
+            ai_moves += 1
+            stats.append(mcts.root_statistics() if record_stats else None)
+        else:
+            if opponent == "greedy":
+                move = board.greedy_move(opponent_player)
+            else:
+                move = board.best_move_depth(opponent_player, int(opponent[5:]))
+            stats.append(None)
+        board.update_board(player, move)
+        moves.append(int(move))
+        player = 1 if player == 2 else 2
+
+    score = board.get_score()
+    return {"configuration": configuration, "game": game_number, "seed": seed_value,
+            "ai_score": score[ai_player - 1], "opponent_score": score[opponent_player - 1],
+            "ai_seconds": ai_seconds, "ai_moves": ai_moves}, (board_data, moves, stats if record_stats else None)
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays a resumable tournament of the MCTS AI against "
+                                     "simple opponents over a grid of MCTS parameters.")
+    parser.add_argument("--output", default="tournament.jsonl", help="JSONL file the game results are appended to")
+    parser.add_argument("--size", type=int, nargs=2, default=[7, 8], metavar=("ROWS", "COLUMNS"))
+    parser.add_argument("--games", type=int, default=100, help="games per configuration")
+    parser.add_argument("--iterations", type=int, nargs="+", default=[100])
+    parser.add_argument("--exploration", type=float, nargs="+", default=[2.0])
+    parser.add_argument("--intelligence", type=float, nargs="+", default=[0.5])
+    parser.add_argument("--opponents", nargs="+", default=["greedy"], help="greedy or depth<d>, e.g. depth3")
+    parser.add_argument("--ai-first", choices=["yes", "no", "both"], default="both",
+                        help="whether the AI moves first")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: number of cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--confidence", type=float, default=0.95, help="confidence level of the win rate intervals")
+    parser.add_argument("--records", default=None, help="GameRecords file the games are also appended to")
+    parser.add_argument("--record-stats", action="store_true", help="store the AI's root statistics in the records")
+    parser.add_argument("--report-only", action="store_true", help="only print the report of the results so far")
+    args = parser.parse_args()
+
+    tournament = Tournament(args.output, args.size, args.games, args.iterations, args.exploration,
+                            args.intelligence, args.opponents,
+                            {"yes": [True], "no": [False], "both": [True, False]}[args.ai_first], args.seed,
+                            args.records, args.record_stats)
+    if not args.report_only:
+        tournament.run(args.workers, verbose=True)
+    tournament.print_report(args.confidence)
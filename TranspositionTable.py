@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+"""
+TranspositionTable Class: Bounded table of search statistics keyed by a position's Zobrist hash
+(Board.zobrist_hash), so that MCTS can share the statistics of a position reached through different
+sequences of moves. Once the table is full the least recently used position is evicted.
+Takes in the following parameters:
+    - capacity: Maximum number of positions stored in the table
+"""
+class TranspositionTable:
+    def __init__(self, capacity = 100000):
+        self.capacity = capacity
+        self.entries = OrderedDict() # key -> [num_visits, num_wins, score_value]
+
+        # Counters for sizing the table
+        self.num_lookups = 0
+        self.num_hits = 0
+        self.num_evictions = 0
+
+
+    # Returns the [num_visits, num_wins, score_value] entry for a position, or None if it isn't stored
+    def lookup(self, key):
+        self.num_lookups += 1
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.num_hits += 1
+            self.entries.move_to_end(key)
+        return entry
+
+
+    # Adds the results of num_simulations simulated games to a position's entry
+    def update(self, key, win_loss, score_value, num_simulations = 1):
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [0, 0, 0]
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.num_evictions += 1
+        else:
+            self.entries.move_to_end(key)
+        entry[0] += num_simulations
+        entry[1] += win_loss
+        entry[2] += score_value
+
+
+    # Returns the hit rate and occupancy counters as a dictionary
+    def get_stats(self):
+        return {
+            "capacity": self.capacity,
+            "size": len(self.entries),
+            "occupancy": len(self.entries) / self.capacity,
+            "lookups": self.num_lookups,
+            "hits": self.num_hits,
+            "hit_rate": self.num_hits / self.num_lookups if self.num_lookups > 0 else 0.0,
+            "evictions": self.num_evictions,
+        }
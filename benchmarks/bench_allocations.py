@@ -0,0 +1,73 @@
+"""
+Benchmark: allocations and time of the board copies MCTS used to make every iteration (a deepcopy 
+of the game board per selection and of the search board per expanded child) against the scratch 
+board operations that replaced them (copy_into, push_move and pop_move).
+Allocations are counted as the number of memory blocks still allocated while the results are held.
+Run from the repository root with:
+    python benchmarks/bench_allocations.py
+"""
+import copy
+import os
+import sys
+import tracemalloc
+from random import seed
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board
+import MCTS
+
+
+# Returns the memory blocks allocated and microseconds taken per call of operation
+def measure(operation, num_calls = 2000):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [operation() for _ in range(num_calls)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del results
+
+    start_time = perf_counter()
+    for _ in range(num_calls):
+        operation()
+    return blocks / num_calls, (perf_counter() - start_time) / num_calls * 1e6
+
+
+if __name__ == "__main__":
+    seed(0)
+    np.random.seed(0)
+    board = Board(size=(7,8))
+    scratch = copy.deepcopy(board)
+    move = board.legal_moves()[0]
+
+    def copy_and_move():
+        child_board = copy.deepcopy(board)
+        child_board.update_board(1, move)
+        return child_board
+
+    def push_and_pop():
+        scratch.push_move(1, move)
+        scratch.pop_move()
+
+    print(f"{'operation':<34} {'blocks/call':>12} {'us/call':>9}")
+    for name, operation in [("deepcopy(board)", lambda: copy.deepcopy(board)),
+                            ("board.copy_into(scratch)", lambda: board.copy_into(scratch)),
+                            ("deepcopy(board) + update_board", copy_and_move),
+                            ("push_move + pop_move", push_and_pop)]:
+        blocks, microseconds = measure(operation)
+        print(f"{name:<34} {blocks:>12.1f} {microseconds:>9.1f}")
+
+    # Counting the deepcopy calls of a whole search
+    num_deepcopies = 0
+    def counting_deepcopy(x):
+        global num_deepcopies
+        num_deepcopies += 1
+        return copy.deepcopy(x)
+    MCTS.deepcopy = counting_deepcopy
+    search = MCTS.MCTS(board, 1)
+    search.select_move(num_iterations = 200)
+    print()
+    print(f"deepcopy calls in an MCTS search of 200 iterations: {num_deepcopies} (all in MCTS.__init__)")
@@ -0,0 +1,44 @@
+"""
+Benchmark: time-budgeted and early-stopping MCTS searches over a full game against a greedy
+opponent. For every AI move it reports the iterations the search ran out of its budget and how 
+long the move took.
+Run from the repository root with:
+    python benchmarks/bench_anytime.py [max_iterations] [time_limit]
+"""
+import os
+import sys
+from random import seed
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board
+from MCTS import MCTS
+
+
+if __name__ == "__main__":
+    max_iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    time_limit = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    seed(0)
+    np.random.seed(0)
+    board = Board(size=(7,8))
+    board_size = board.size[0] * board.size[1]
+
+    print(f"max_iterations={max_iterations}, time_limit={time_limit}s")
+    print(f"{'move':>5} {'% done':>7} {'iterations':>11} {'seconds':>8}")
+    total_iterations, num_moves = 0, 0
+    while sum(board.get_score()) < board_size:
+        mcts = MCTS(board, 1, exploration_parameter = 1)
+        start_time = perf_counter()
+        move = mcts.select_move(time_limit = time_limit, max_iterations = max_iterations)
+        iterations = mcts.last_num_iterations
+        print(f"{num_moves:>5} {board.get_percentage_done() * 100:>6.0f}% {iterations:>11} {perf_counter() - start_time:>8.3f}")
+        total_iterations += iterations
+        num_moves += 1
+
+        board.update_board(1, move)
+        if sum(board.get_score()) < board_size:
+            board.update_board(2, board.greedy_move(2))
+    print(f"Iterations used: {total_iterations} of {num_moves * max_iterations} " + 
+          f"({total_iterations / (num_moves * max_iterations) * 100:.0f}%), final score {board.get_score()}")
@@ -0,0 +1,85 @@
+"""
+Benchmark: search nodes and latency of Board.best_move_depth (memoized, only gaining moves, pruned)
+against the original exhaustive helper (benchmarks/legacy_board.py) for each lookahead depth.
+Both are run on the same positions taken from random games and must return the same moves.
+Run from the repository root with:
+    python benchmarks/bench_best_move_depth.py [max_legacy_depth]
+"""
+import os
+import sys
+from random import choice, seed
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board
+from legacy_board import LegacyBoard
+
+
+# Wraps a recursive method so every call is counted in counter[0]
+def count_calls(board_class, method_name, counter):
+    method = getattr(board_class, method_name)
+    def counted(*args, **kwargs):
+        counter[0] += 1
+        return method(*args, **kwargs)
+    setattr(board_class, method_name, counted)
+
+
+# Returns positions from random games after the given numbers of moves, as (start data, moves played)
+def sample_positions(size, move_numbers, num_games):
+    positions = []
+    for _ in range(num_games):
+        board = Board(size=size)
+        start_data = board.data.copy()
+        moves = []
+        for move_number in range(max(move_numbers) + 1):
+            if move_number in move_numbers:
+                positions.append((start_data, list(moves)))
+            move = choice(board.legal_moves())
+            board.update_board(move_number % 2 + 1, move)
+            moves.append(move)
+    return positions
+
+
+# Recreates a position on the given board class by replaying its moves
+def replay(board_class, position):
+    data, moves = position
+    board = board_class(data=data.copy())
+    for move_number, move in enumerate(moves):
+        board.update_board(move_number % 2 + 1, move)
+    return board
+
+
+# Returns the average search nodes and milliseconds per call, and the moves chosen
+def measure(board_class, positions, depth, counter):
+    boards = [replay(board_class, position) for position in positions]
+    counter[0] = 0
+    moves = []
+    start_time = perf_counter()
+    for inx, board in enumerate(boards):
+        np.random.seed(inx) # Same random tie breaking for both implementations
+        moves.append(board.best_move_depth(len(positions[inx][1]) % 2 + 1, depth))
+    return counter[0] / len(boards), (perf_counter() - start_time) / len(boards) * 1000, moves
+
+
+if __name__ == "__main__":
+    max_legacy_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    legacy_calls, new_calls = [0], [0]
+    count_calls(LegacyBoard, "best_move_depth_helper", legacy_calls)
+    count_calls(Board, "best_move_depth_search", new_calls)
+
+    seed(0)
+    np.random.seed(0)
+    for size in [(7,8), (14,16)]:
+        positions = sample_positions(size, [2, 10, 20], 5)
+        print(f"{size[0]}x{size[1]} board, {len(positions)} positions")
+        print(f"{'depth':>6} {'legacy nodes':>13} {'legacy ms':>10} {'nodes':>8} {'ms':>8} {'same moves':>11}")
+        for depth in range(2, 7):
+            nodes, milliseconds, moves = measure(Board, positions, depth, new_calls)
+            if depth <= max_legacy_depth:
+                legacy_nodes, legacy_milliseconds, legacy_moves = measure(LegacyBoard, positions, depth, legacy_calls)
+                print(f"{depth:>6} {legacy_nodes:>13.0f} {legacy_milliseconds:>10.2f} {nodes:>8.0f} {milliseconds:>8.2f}" + 
+                      f" {str(moves == legacy_moves):>11}")
+            else:
+                print(f"{depth:>6} {'-':>13} {'-':>10} {nodes:>8.0f} {milliseconds:>8.2f} {'-':>11}")
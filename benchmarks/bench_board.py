@@ -0,0 +1,54 @@
+"""
+Benchmark: full random and greedy games per second for the bitboard Board against the 
+original set-of-tuple implementation (benchmarks/legacy_board.py).
+Run from the repository root with:
+    python benchmarks/bench_board.py
+"""
+import os
+import sys
+from random import choice, seed
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board
+from legacy_board import LegacyBoard
+
+
+# Plays a full game with both players choosing uniformly random legal moves
+def play_random_game(board):
+    board_size = board.size[0] * board.size[1]
+    player = 1
+    while sum(board.get_score()) < board_size:
+        board.update_board(player, choice(board.legal_moves()))
+        player = 1 if player == 2 else 2
+
+
+# Plays a full game with both players choosing greedy moves
+def play_greedy_game(board):
+    board_size = board.size[0] * board.size[1]
+    player = 1
+    while sum(board.get_score()) < board_size:
+        board.update_board(player, board.greedy_move(player))
+        player = 1 if player == 2 else 2
+
+
+# Returns the number of games per second played on copies of the given boards
+def games_per_second(board_class, boards, play_game):
+    start_time = perf_counter()
+    for data in boards:
+        play_game(board_class(data=data.copy()))
+    return len(boards) / (perf_counter() - start_time)
+
+
+if __name__ == "__main__":
+    seed(0)
+    np.random.seed(0)
+    for name, play_game in [("random", play_random_game), ("greedy", play_greedy_game)]:
+        print(f"{name + ' games':>14} {'legacy games/s':>16} {'bitboard games/s':>18} {'speedup':>8}")
+        for size, num_games in [((7,8), 200), ((10,10), 100), ((14,16), 50), ((20,20), 20), ((30,30), 5)]:
+            boards = [Board(size=size).data for _ in range(num_games)]
+            legacy = games_per_second(LegacyBoard, boards, play_game)
+            bitboard = games_per_second(Board, boards, play_game)
+            print(f"{size[0]:>9}x{size[1]:<4} {legacy:>16.1f} {bitboard:>18.1f} {bitboard / legacy:>7.1f}x")
@@ -0,0 +1,90 @@
+"""
+Benchmark: move latency and move quality of select_move in endgames with the EndgameSolver against
+searching with MCTS only, and random rollouts per second when they stop once a player holds more than
+half the board against playing them to the end. Move quality is measured as the final score margin
+lost against the best move, found by solving the position after the chosen move.
+Run from the repository root with:
+    python benchmarks/bench_endgame.py
+"""
+import os
+import sys
+from random import choice, random, seed
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board
+from EndgameSolver import EndgameSolver
+from MCTS import MCTS
+
+
+# Returns positions with at most the given number of uncaptured cells, from games between players
+# mixing greedy and random moves, and the player to move in each
+def endgame_positions(size, num_cells, num_positions):
+    positions = []
+    board_size = size[0] * size[1]
+    while len(positions) < num_positions:
+        board = Board(size=size)
+        player = 1
+        while board_size - sum(board.get_score()) > num_cells:
+            move = board.greedy_move(player) if random() < 0.7 else choice(board.legal_moves())
+            board.update_board(player, move)
+            player = 1 if player == 2 else 2
+        if sum(board.get_score()) < board_size:
+            positions.append((board, player))
+    return positions
+
+
+# Returns the final score margin the move leads to with best play afterwards
+def move_value(board, player, move):
+    board.push_move(player, move)
+    other_player = 1 if player == 2 else 2
+    _, value = EndgameSolver(board, node_budget=10**7).solve(other_player)
+    board.pop_move()
+    return -value
+
+
+# Plays a random game to the end with push_move and takes the moves back (the rollouts before they stopped early)
+def full_rollout(mcts, board):
+    board_size = board.size[0] * board.size[1]
+    while sum(board.get_score()) < board_size:
+        board.push_move(mcts.other_player, choice(board.legal_moves()))
+        board.push_move(mcts.player, choice(board.legal_moves()))
+    while board.undo_log:
+        board.pop_move()
+
+
+if __name__ == "__main__":
+    seed(0)
+    np.random.seed(0)
+    print(f"{'endgame':>14} {'mcts ms':>8} {'margin lost':>12} {'solver ms':>10} {'margin lost':>12} {'solved':>7}")
+    for size, num_cells in [((7,8), 8), ((7,8), 12), ((14,16), 12), ((14,16), 16)]:
+        positions = endgame_positions(size, num_cells, 10)
+        results = {}
+        for name, endgame_cells in [("mcts", None), ("solver", num_cells)]:
+            elapsed, margin_lost, num_solved = 0, 0, 0
+            for board, player in positions:
+                mcts = MCTS(board, player, endgame_cells=endgame_cells)
+                start_time = perf_counter()
+                move = mcts.select_move(num_iterations=1000)
+                elapsed += perf_counter() - start_time
+                num_solved += mcts.last_solution is not None
+                best_value = max(move_value(board, player, legal_move) for legal_move in board.legal_moves())
+                margin_lost += best_value - move_value(board, player, move)
+            results[name] = (elapsed / len(positions) * 1000, margin_lost / len(positions), num_solved)
+        print(f"{f'{size[0]}x{size[1]}, {num_cells} cells':>14} {results['mcts'][0]:>8.1f} {results['mcts'][1]:>12.2f}" + 
+              f" {results['solver'][0]:>10.1f} {results['solver'][1]:>12.2f} {results['solver'][2]:>4}/{len(positions)}")
+
+    print()
+    print(f"{'rollouts':>14} {'full/s':>8} {'early stop/s':>13} {'speedup':>8}")
+    for size, num_rollouts in [((7,8), 1000), ((14,16), 300), ((20,20), 100)]:
+        board = Board(size=size)
+        mcts = MCTS(board, 1)
+        rates = []
+        for rollout in [full_rollout, lambda mcts, board: mcts.simulate(board)]:
+            start_time = perf_counter()
+            for _ in range(num_rollouts):
+                rollout(mcts, mcts.search_board)
+            rates.append(num_rollouts / (perf_counter() - start_time))
+        print(f"{size[0]:>9}x{size[1]:<4} {rates[0]:>8.1f} {rates[1]:>13.1f} {rates[1] / rates[0]:>7.1f}x")
@@ -0,0 +1,61 @@
+"""
+Benchmark: size on disk, write speed, and scan and replay speed of GameRecords files of random games,
+with the projected size of a million games.
+Run from the repository root with:
+    python benchmarks/bench_game_records.py [num_games]
+"""
+import os
+import sys
+import tempfile
+from random import choice, seed
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board, generate_boards
+from GameRecords import GameRecords
+
+
+# Plays a random game from the given board colors and returns its moves
+def random_game(board_data):
+    board = Board(data=board_data.astype(int))
+    board_size = board.size[0] * board.size[1]
+    moves = []
+    while sum(board.get_score()) < board_size:
+        move = choice(board.legal_moves())
+        board.update_board(len(moves) % 2 + 1, move)
+        moves.append(move)
+    return moves
+
+
+if __name__ == "__main__":
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    seed(0)
+    print(f"{'size':>8} {'games':>7} {'bytes/game':>11} {'MB per 1M':>10} {'write games/s':>14}" + 
+          f" {'score scan s':>13} {'scan games/s':>13} {'replay games/s':>15}")
+    for size in [(7,8), (14,16)]:
+        boards = generate_boards(num_games, size, seed=0)
+        games = [random_game(board_data) for board_data in boards]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.rec")
+            records = GameRecords(path, size)
+            start_time = perf_counter()
+            records.append_games(boards, games)
+            write_rate = num_games / (perf_counter() - start_time)
+            bytes_per_game = (os.path.getsize(path) - GameRecords.header_size) / num_games
+
+            # Scanning the memory-mapped scores of every game from a fresh reader
+            start_time = perf_counter()
+            scores = GameRecords(path).records()["score"]
+            player_1_wins = int((scores[:, 0] > scores[:, 1]).sum())
+            scan_time = perf_counter() - start_time
+
+            # Replaying the first games position by position
+            num_replayed = min(num_games, 2000)
+            start_time = perf_counter()
+            for index in range(num_replayed):
+                for _ in records.replay(index):
+                    pass
+            replay_rate = num_replayed / (perf_counter() - start_time)
+            del scores
+        print(f"{size[0]:>4}x{size[1]:<3} {num_games:>7} {bytes_per_game:>11.0f} {bytes_per_game:>10.0f}" + 
+              f" {write_rate:>14.0f} {scan_time:>13.4f} {num_games / scan_time:>13.0f} {replay_rate:>15.0f}")
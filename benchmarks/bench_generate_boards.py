@@ -0,0 +1,27 @@
+"""
+Benchmark: boards generated per second by Board(size=...) (fix_board) against the vectorized, seeded
+generate_boards, by board size.
+Run from the repository root with:
+    python benchmarks/bench_generate_boards.py
+"""
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board, generate_boards
+
+
+if __name__ == "__main__":
+    print(f"{'size':>10} {'Board() boards/s':>17} {'generate_boards boards/s':>25} {'speedup':>8}")
+    for size, num_boards in [((7,8), 200), ((14,16), 50), ((30,30), 10), ((50,50), 4)]:
+        start_time = perf_counter()
+        for _ in range(num_boards):
+            Board(size=size)
+        fix_board_rate = num_boards / (perf_counter() - start_time)
+
+        num_generated = max(100000 * 56 // (size[0] * size[1]), 4096)
+        start_time = perf_counter()
+        generate_boards(num_generated, size, seed=0)
+        generate_rate = num_generated / (perf_counter() - start_time)
+        print(f"{size[0]:>5}x{size[1]:<4} {fix_board_rate:>17.1f} {generate_rate:>25.1f} {generate_rate / fix_board_rate:>7.0f}x")
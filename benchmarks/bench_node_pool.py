@@ -0,0 +1,99 @@
+"""
+Benchmark: memory per node and selection speed of the array-backed NodePool against the one
+Python object per node tree MCTS used before.
+Run from the repository root with:
+    python benchmarks/bench_node_pool.py [num_nodes]
+"""
+import os
+import sys
+import tracemalloc
+from math import log, sqrt
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from NodePool import NodePool
+
+
+# The node class of the original object tree
+class ObjectNode:
+    def __init__(self, color, parent = None):
+        self.num_visits = 1
+        self.color = color
+        self.num_wins = 0
+        self.score_value = 0
+        self.children = []
+        self.parent = parent
+
+    def add_child(self, color):
+        child = self.__class__(color, self)
+        self.children.append(child)
+
+
+# Builds a tree of about num_nodes nodes where every expanded node has 5 children
+def build_object_tree(num_nodes):
+    root = ObjectNode(0)
+    frontier = [root]
+    count = 1
+    while count < num_nodes:
+        node = frontier.pop(0)
+        for color in range(5):
+            node.add_child(color)
+        frontier.extend(node.children)
+        count += 5
+    return root
+
+
+def build_pool_tree(num_nodes):
+    pool = NodePool()
+    root = pool.add_root(0)
+    node = root
+    while pool.size < num_nodes:
+        pool.add_children(node, [0, 1, 2, 3, 4])
+        node += 1
+    return pool
+
+
+# Returns the bytes allocated per node while building a tree
+def bytes_per_node(build, num_nodes):
+    tracemalloc.start()
+    tree = build(num_nodes)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return allocated / num_nodes
+
+
+if __name__ == "__main__":
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print(f"NodePool array bytes per node: {NodePool.bytes_per_node()}")
+    print(f"{'tree':<12} {'bytes/node':>11}")
+    print(f"{'objects':<12} {bytes_per_node(build_object_tree, num_nodes):>11.1f}")
+    print(f"{'NodePool':<12} {bytes_per_node(build_pool_tree, num_nodes):>11.1f}")
+
+    # Timing UCT selection over the root's children
+    num_selections = 20000
+    root = build_object_tree(6)
+    for inx, child in enumerate(root.children):
+        child.num_visits, child.num_wins, child.score_value = 10 + inx, 3, 4.5
+    root.num_visits = 100
+    start_time = perf_counter()
+    for _ in range(num_selections):
+        best_weight, selected = 0.0, None
+        for child in root.children:
+            if child.color != 5:
+                weight = (child.num_wins + child.score_value) / child.num_visits + 2 * sqrt(log(root.num_visits) / child.num_visits)
+                if weight >= best_weight:
+                    best_weight, selected = weight, child
+    object_time = (perf_counter() - start_time) / num_selections * 1e6
+
+    pool = build_pool_tree(6)
+    children = pool.children(0)
+    pool.num_visits[children] = 10 + np.arange(5)
+    pool.num_wins[children], pool.score_value[children], pool.num_visits[0] = 3, 4.5, 100
+    start_time = perf_counter()
+    for _ in range(num_selections):
+        pool.select_child(0, 2, 5)
+    pool_time = (perf_counter() - start_time) / num_selections * 1e6
+    print()
+    print(f"UCT selection over 5 children: objects {object_time:.2f} us, NodePool {pool_time:.2f} us")
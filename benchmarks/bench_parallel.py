@@ -0,0 +1,39 @@
+"""
+Benchmark: scaling of parallel MCTS searches (select_move with workers=k). Reports iterations 
+per second and speedup over one worker for every worker count up to the number of cores
+(or up to max_workers if given). Early stopping is turned off so every search runs all its iterations.
+Run from the repository root with:
+    python benchmarks/bench_parallel.py [num_iterations] [max_workers]
+"""
+import os
+import sys
+from multiprocessing import cpu_count
+from random import seed
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board
+from MCTS import MCTS, get_worker_pool
+
+
+if __name__ == "__main__":
+    num_iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else cpu_count()
+    seed(0)
+    np.random.seed(0)
+    board = Board(size=(7,8))
+
+    print(f"{cpu_count()} cores, {num_iterations} iterations on 7x8")
+    print(f"{'workers':>8} {'iterations/s':>14} {'speedup':>8}")
+    base_rate = None
+    for workers in range(1, max_workers + 1):
+        if workers > 1:
+            get_worker_pool(workers) # Starting the pool outside of the timing
+        mcts = MCTS(board, 1, exploration_parameter = 1)
+        start_time = perf_counter()
+        mcts.select_move(num_iterations = num_iterations, workers = workers, seed = 0, early_stopping = False)
+        rate = mcts.last_num_iterations / (perf_counter() - start_time)
+        base_rate = base_rate or rate
+        print(f"{workers:>8} {rate:>14.1f} {rate / base_rate:>7.2f}x")
@@ -0,0 +1,49 @@
+"""
+Benchmark: the search report of select_move(..., return_report=True) for a few search settings, and
+the time of searches with and without recording a report, to check that instrumentation stays cheap.
+Run from the repository root with:
+    python benchmarks/bench_profiling.py
+"""
+import json
+import os
+import sys
+from random import seed
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board
+from MCTS import MCTS
+
+
+# Returns the seconds taken by a seeded search with or without a report
+def search_time(board, num_iterations, return_report, **mcts_parameters):
+    seed(0)
+    np.random.seed(0)
+    mcts = MCTS(board, 1, **mcts_parameters)
+    start_time = perf_counter()
+    mcts.select_move(num_iterations=num_iterations, early_stopping=False, return_report=return_report)
+    return perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    seed(0)
+    np.random.seed(0)
+    board = Board(size=(7,8))
+    settings = [("default", {}), ("batched rollouts", {"rollouts_per_child": 8}), 
+                ("transposition table", {"transposition_table_size": 10000})]
+
+    for name, mcts_parameters in settings:
+        _, report = MCTS(board, 1, **mcts_parameters).select_move(num_iterations=300, early_stopping=False, 
+                                                                   return_report=True)
+        print(f"{name}:")
+        print(json.dumps(report, indent=2))
+        print()
+
+    print(f"{'search':>20} {'no report s':>12} {'report s':>9} {'overhead':>9}")
+    for name, mcts_parameters in settings:
+        # Taking the best of a few runs of each to reduce noise
+        without_report = min(search_time(board, 500, False, **mcts_parameters) for _ in range(3))
+        with_report = min(search_time(board, 500, True, **mcts_parameters) for _ in range(3))
+        print(f"{name:>20} {without_report:>12.3f} {with_report:>9.3f} {with_report / without_report - 1:>8.1%}")
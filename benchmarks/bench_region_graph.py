@@ -0,0 +1,80 @@
+"""
+Benchmark: random rollouts per second and time per move of the RegionGraph against rollouts played 
+on the bitboard Board with push_move / pop_move (as MCTS.simulate does), by board size. Boards made
+by fix_board have only single cell regions, so unfixed boards (random colors with touching cells of 
+the same color, like some real games) are measured too.
+Run from the repository root with:
+    python benchmarks/bench_region_graph.py
+"""
+import os
+import sys
+from random import choice, seed
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board
+from RegionGraph import RegionGraph
+
+
+# Plays a random game on the board with push_move and takes the moves back, returning the number of moves
+def board_rollout(board):
+    board_size = board.size[0] * board.size[1]
+    player = 1
+    while sum(board.get_score()) < board_size:
+        board.push_move(player, choice(board.legal_moves()))
+        player = 1 if player == 2 else 2
+    num_moves = len(board.undo_log)
+    while board.undo_log:
+        board.pop_move()
+    return num_moves
+
+
+# Plays a random game on the region graph, returning the number of moves
+def graph_rollout(graph):
+    state = graph.get_state()
+    player = 1
+    num_moves = 0
+    while sum(graph.get_score()) < graph.board_size:
+        graph.update_board(player, choice(graph.legal_moves()))
+        player = 1 if player == 2 else 2
+        num_moves += 1
+    graph.set_state(state)
+    return num_moves
+
+
+# Returns the rollouts per second and microseconds per move of the rollout function on the positions
+def measure(positions, rollout, num_rollouts):
+    num_moves = 0
+    start_time = perf_counter()
+    for inx in range(num_rollouts):
+        num_moves += rollout(positions[inx % len(positions)])
+    elapsed = perf_counter() - start_time
+    return num_rollouts / elapsed, elapsed / num_moves * 1e6
+
+
+# Returns a board of the given size without fix_board, so touching cells can share a color
+def unfixed_board(size):
+    data = np.random.randint(0, high=6, size=size)
+    if data[size[0]-1,0] == data[0,size[1]-1]:
+        data[0,size[1]-1] = (data[0,size[1]-1] + 1) % 6
+    return Board(data=data)
+
+
+if __name__ == "__main__":
+    seed(0)
+    np.random.seed(0)
+    for name, make_board in [("fixed", lambda size: Board(size=size)), ("unfixed", unfixed_board)]:
+        print(f"{name + ' boards':>15} {'regions':>8} {'build ms':>9} {'board rollouts/s':>17} {'us/move':>8}" + 
+              f" {'graph rollouts/s':>17} {'us/move':>8} {'speedup':>8}")
+        for size, num_rollouts in [((10,10), 200), ((20,20), 100), ((30,30), 40), ((50,50), 10)]:
+            boards = [make_board(size) for _ in range(5)]
+            start_time = perf_counter()
+            graphs = [RegionGraph(board) for board in boards]
+            build_milliseconds = (perf_counter() - start_time) / len(graphs) * 1000
+            num_regions = np.mean([graph.num_regions for graph in graphs])
+            board_rate, board_move_time = measure(boards, board_rollout, num_rollouts)
+            graph_rate, graph_move_time = measure(graphs, graph_rollout, num_rollouts)
+            print(f"{size[0]:>10}x{size[1]:<4} {num_regions:>8.0f} {build_milliseconds:>9.1f} {board_rate:>17.1f}" + 
+                  f" {board_move_time:>8.1f} {graph_rate:>17.1f} {graph_move_time:>8.1f} {graph_rate / board_rate:>7.1f}x")
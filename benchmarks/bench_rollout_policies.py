@@ -0,0 +1,84 @@
+"""
+Benchmark: playouts per second of each MCTS rollout policy (single games and BatchSimulator batches), 
+and playing strength per unit of time: the win rate against the greedy player of MCTS searches given 
+the same time per move with each policy.
+Run from the repository root with:
+    python benchmarks/bench_rollout_policies.py [num_games] [seconds_per_move]
+"""
+import os
+import sys
+from random import seed
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board, generate_boards
+from BatchSimulator import BatchSimulator
+from MCTS import MCTS
+
+
+policies = [("random", {"rollout_policy": "random"}), 
+            ("epsilon_greedy 0.1", {"rollout_policy": "epsilon_greedy", "rollout_epsilon": 0.1}),
+            ("epsilon_greedy 0.3", {"rollout_policy": "epsilon_greedy", "rollout_epsilon": 0.3}),
+            ("softmax 1", {"rollout_policy": "softmax", "rollout_temperature": 1.0}),
+            ("softmax 3", {"rollout_policy": "softmax", "rollout_temperature": 3.0})]
+
+
+# Returns the playouts per second of MCTS.simulate from the board with the given policy
+def playouts_per_second(board, policy_parameters, num_playouts):
+    mcts = MCTS(board, 1, **policy_parameters)
+    start_time = perf_counter()
+    for _ in range(num_playouts):
+        mcts.simulate(mcts.search_board)
+    return num_playouts / (perf_counter() - start_time)
+
+
+# Returns the playouts per second of BatchSimulator batches from the board with the given policy
+def batch_playouts_per_second(board, policy_parameters, batch_size, num_batches):
+    start_time = perf_counter()
+    for _ in range(num_batches):
+        BatchSimulator([board] * batch_size, **policy_parameters).simulate(1, 1)
+    return batch_size * num_batches / (perf_counter() - start_time)
+
+
+# Plays MCTS (as player 1, with the given policy and time per move) against the greedy player on each 
+# board and returns the win rate and the average number of iterations per move
+def win_rate(boards, policy_parameters, seconds_per_move):
+    wins = 0
+    num_iterations, num_moves = 0, 0
+    for board_data in boards:
+        board = Board(data=board_data.astype(int))
+        board_size = board.size[0] * board.size[1]
+        player = 1
+        while sum(board.get_score()) < board_size:
+            if player == 1:
+                mcts = MCTS(board, 1, **policy_parameters)
+                move = mcts.select_move(time_limit=seconds_per_move)
+                num_iterations += mcts.last_num_iterations
+                num_moves += 1
+            else:
+                move = board.greedy_move(2)
+            board.update_board(player, move)
+            player = 1 if player == 2 else 2
+        wins += board.get_score()[0] > board.get_score()[1]
+    return wins / len(boards), num_iterations / num_moves
+
+
+if __name__ == "__main__":
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    seconds_per_move = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    seed(0)
+    np.random.seed(0)
+    board = Board(data=generate_boards(1, (7,8), seed=1)[0].astype(int))
+    boards = generate_boards(num_games, (7,8), seed=2)
+
+    print(f"{'policy':>20} {'playouts/s':>11} {'batch playouts/s':>17} {'win rate vs greedy':>19} {'iterations/move':>16}")
+    for name, policy_parameters in policies:
+        rate = playouts_per_second(board, policy_parameters, 1000)
+        batch_rate = batch_playouts_per_second(board, policy_parameters, 256, 10)
+        seed(0)
+        np.random.seed(0)
+        wins, iterations = win_rate(boards, policy_parameters, seconds_per_move)
+        print(f"{name:>20} {rate:>11.0f} {batch_rate:>17.0f} {wins:>19.2f} {iterations:>16.1f}")
+    print(f"({num_games} games of 7x8 per policy as the first player, {seconds_per_move} s per move)")
@@ -0,0 +1,63 @@
+"""
+Benchmark: random playouts per second of the one-game-at-a-time MCTS.simulate against the
+vectorized BatchSimulator, and of whole MCTS searches with different rollouts_per_child.
+Run from the repository root with:
+    python benchmarks/bench_rollouts.py
+"""
+import os
+import sys
+from copy import deepcopy
+from random import seed
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board
+from BatchSimulator import BatchSimulator
+from MCTS import MCTS
+
+
+# Returns the playouts per second of the scalar simulation step
+def scalar_playouts_per_second(board, num_playouts):
+    mcts = MCTS(board, 1)
+    start_time = perf_counter()
+    for _ in range(num_playouts):
+        mcts.simulate(deepcopy(board))
+    return num_playouts / (perf_counter() - start_time)
+
+
+# Returns the playouts per second of a BatchSimulator with the given batch size
+def batch_playouts_per_second(board, batch_size):
+    start_time = perf_counter()
+    BatchSimulator([board] * batch_size).simulate(1, 2)
+    return batch_size / (perf_counter() - start_time)
+
+
+# Returns the playouts per second of a full MCTS search
+def search_playouts_per_second(board, rollouts_per_child, num_iterations):
+    mcts = MCTS(board, 1, exploration_parameter = 1, rollouts_per_child = rollouts_per_child)
+    start_time = perf_counter()
+    mcts.select_move(num_iterations = num_iterations)
+    children = mcts.tree.children(mcts.root_node)
+    num_playouts = (mcts.tree.num_visits[children] - 1).sum()
+    return num_playouts / (perf_counter() - start_time)
+
+
+if __name__ == "__main__":
+    seed(0)
+    np.random.seed(0)
+    batch_sizes = [8, 64, 512, 2048]
+    print(f"{'size':>8} {'scalar':>10}" + "".join(f"{'batch ' + str(n):>12}" for n in batch_sizes))
+    for size in [(7,8), (14,16), (20,20)]:
+        board = Board(size=size)
+        row = f"{size[0]:>3}x{size[1]:<4} {scalar_playouts_per_second(board, 200):>10.0f}"
+        row += "".join(f"{batch_playouts_per_second(board, n):>12.0f}" for n in batch_sizes)
+        print(row)
+
+    print()
+    print("MCTS search playouts per second on 7x8 (100 iterations)")
+    board = Board(size=(7,8))
+    for rollouts_per_child in [1, 8, 32, 128]:
+        playouts = search_playouts_per_second(board, rollouts_per_child, 100)
+        print(f"rollouts_per_child={rollouts_per_child:<4} {playouts:>10.0f}")
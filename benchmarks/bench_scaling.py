@@ -0,0 +1,90 @@
+"""
+Benchmark: how the engine scales with the board size and the number of colors, from the 7x8 GUI board
+up to 100x100. For each size and color count it reports the time to generate a move (legal_moves and
+greedy_move) and to make and take back one, random rollouts per second of the bitboard Board, the
+RegionGraph and the BatchSimulator (only for boards up to 64 columns wide), and the time an 
+early-stopping search takes to decide the first move at 95% confidence (capped at max_seconds) with the
+number of tree nodes it used and their memory. Every node takes NodePool.bytes_per_node() bytes whatever
+the board size, and each expansion adds num_colors - 1 nodes.
+Run from the repository root with:
+    python benchmarks/bench_scaling.py [max_seconds] [num_colors ...]
+"""
+import os
+import sys
+from random import seed
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board
+from BatchSimulator import BatchSimulator
+from MCTS import MCTS
+from NodePool import NodePool
+from RegionGraph import RegionGraph
+
+
+sizes = [(7,8), (10,12), (14,16), (20,20), (30,30), (50,50), (64,64), (100,100)]
+
+
+# Calls step repeatedly for at least min_seconds (and at least min_calls times) and returns the number
+# of calls per second
+def calls_per_second(step, min_seconds = 0.5, min_calls = 3):
+    num_calls = 0
+    start_time = perf_counter()
+    while num_calls < min_calls or perf_counter() - start_time < min_seconds:
+        step()
+        num_calls += 1
+    return num_calls / (perf_counter() - start_time)
+
+
+# Returns the microseconds per legal_moves + greedy_move call and per push_move + pop_move pair
+def move_generation_time(board):
+    generate = calls_per_second(lambda: (board.legal_moves(), board.greedy_move(1)), 0.2, 100)
+    move = board.greedy_move(1)
+    make = calls_per_second(lambda: (board.push_move(1, move), board.pop_move()), 0.2, 100)
+    return 1e6 / generate, 1e6 / make
+
+
+# Returns the random rollouts per second of MCTS.simulate on the Board, RegionGraph.simulate and
+# BatchSimulator batches of 64 games (None if the board is too wide for it)
+def rollout_rates(board):
+    mcts = MCTS(board, 1)
+    board_rate = calls_per_second(lambda: mcts.simulate(mcts.search_board))
+    graph = RegionGraph(board)
+    graph_rate = calls_per_second(lambda: graph.simulate(1, 2))
+    batch_rate = None
+    if board.size[1] <= 64:
+        batch_rate = 64 * calls_per_second(lambda: BatchSimulator([board] * 64).simulate(1, 2))
+    return board_rate, graph_rate, batch_rate
+
+
+# Searches the first move with early stopping until it is decided or max_seconds pass. Returns the
+# seconds taken, the iterations run, whether the move was decided and the tree's number of nodes.
+def time_to_decided_move(board, max_seconds):
+    mcts = MCTS(board, 1)
+    start_time = perf_counter()
+    mcts.select_move(time_limit=max_seconds, early_stopping=True)
+    seconds = perf_counter() - start_time
+    return seconds, mcts.last_num_iterations, mcts.is_decided(), mcts.tree.size
+
+
+if __name__ == "__main__":
+    max_seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    color_counts = [int(num_colors) for num_colors in sys.argv[2:]] or [5, 6, 8]
+
+    print(f"{'size':>8} {'colors':>6} {'movegen us':>10} {'make us':>8} {'board ro/s':>10} {'graph ro/s':>10}" +
+          f" {'batch ro/s':>10} {'decide s':>9} {'iters':>6} {'decided':>7} {'nodes':>7} {'tree KB':>8}")
+    for size in sizes:
+        for num_colors in color_counts:
+            seed(0)
+            np.random.seed(0)
+            board = Board(size, num_colors=num_colors)
+            generate_time, make_time = move_generation_time(board)
+            board_rate, graph_rate, batch_rate = rollout_rates(board)
+            seconds, iterations, decided, num_nodes = time_to_decided_move(board, max_seconds)
+            batch = f"{batch_rate:>10.0f}" if batch_rate is not None else f"{'-':>10}"
+            print(f"{f'{size[0]}x{size[1]}':>8} {num_colors:>6} {generate_time:>10.1f} {make_time:>8.1f}" +
+                  f" {board_rate:>10.1f} {graph_rate:>10.1f} {batch} {seconds:>9.2f} {iterations:>6}" +
+                  f" {str(decided):>7} {num_nodes:>7} {num_nodes * NodePool.bytes_per_node() / 1024:>8.1f}", flush=True)
+    print(f"(tree nodes take {NodePool.bytes_per_node()} bytes each, searches are capped at {max_seconds} s)")
@@ -0,0 +1,32 @@
+"""
+Benchmark: transposition table hit rate, occupancy and evictions for different table sizes and
+board sizes, to help size MCTS(transposition_table_size=...).
+Run from the repository root with:
+    python benchmarks/bench_transpositions.py [num_iterations]
+"""
+import os
+import sys
+from random import seed
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board
+from MCTS import MCTS
+
+
+if __name__ == "__main__":
+    num_iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print(f"{'size':>8} {'table size':>11} {'hit rate':>9} {'occupancy':>10} {'evictions':>10} {'seconds':>8}")
+    for size in [(7,8), (10,10), (14,16)]:
+        for table_size in [1000, 10000, 100000]:
+            seed(0)
+            np.random.seed(0)
+            board = Board(size=size)
+            mcts = MCTS(board, 1, exploration_parameter = 1, transposition_table_size = table_size)
+            start_time = perf_counter()
+            mcts.select_move(num_iterations = num_iterations)
+            stats = mcts.transposition_table.get_stats()
+            print(f"{size[0]:>3}x{size[1]:<4} {table_size:>11} {stats['hit_rate']:>9.3f} {stats['occupancy']:>10.3f}" + 
+                  f" {stats['evictions']:>10} {perf_counter() - start_time:>8.2f}")
@@ -0,0 +1,94 @@
+"""
+Check: plays random games on the bitboard Board and the original set-of-tuple implementation
+(benchmarks/legacy_board.py) side by side and checks that after every move they agree on the score,
+the painted board data and the number of cells each legal move captures next (get_frontier_counts
+against the legacy greedy counts), and every few moves on the best_move_depth moves.
+Run from the repository root with:
+    python benchmarks/check_legacy_board.py [num_games]
+"""
+import os
+import sys
+from random import choice, seed
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Board import Board
+from legacy_board import LegacyBoard
+
+
+# Returns the legacy board's number of cells of each color bordering a player's territory
+def legacy_frontier_counts(legacy, player_number):
+    territory = legacy.player_1_cells_captured if player_number == 1 else legacy.player_2_cells_captured
+    neighbors = set()
+    for cell in territory:
+        neighbors.update(legacy.valid_neighbors([(cell[0]+1,cell[1]), (cell[0]-1,cell[1]),
+                                                 (cell[0],cell[1]+1), (cell[0],cell[1]-1)]))
+    neighbors -= legacy.player_1_cells_captured | legacy.player_2_cells_captured
+    counts = [0] * 6
+    for neighbor in neighbors:
+        counts[legacy.data[neighbor]] += 1
+    return counts
+
+
+# Returns the moves best_move_depth picks on the board for each of the given random states. Both
+# implementations pick with one np.random.choice over the same sorted best moves, so they pick the same
+# moves from the same states exactly when their sets of best moves agree (up to unlucky draws).
+def best_move_depth_picks(board, player_number, depth, random_states):
+    picks = []
+    for state in random_states:
+        np.random.set_state(state)
+        picks.append(int(board.best_move_depth(player_number, depth)))
+    return picks
+
+
+# Plays one random game from the given board data on both implementations and returns a list of the
+# mismatches found
+def check_game(data, num_picks = 10):
+    board = Board(data=data.copy())
+    legacy = LegacyBoard(data=data.copy())
+    board_size = board.size[0] * board.size[1]
+    mismatches = []
+    player = 1
+    num_moves = 0
+    while sum(board.get_score()) < board_size:
+        for player_number in (1, 2):
+            counts = board.get_frontier_counts(player_number)
+            legacy_counts = legacy_frontier_counts(legacy, player_number)
+            if any(counts[move] != legacy_counts[move] for move in board.legal_moves()):
+                mismatches.append(f"move {num_moves}: frontier counts of player {player_number}")
+        if num_moves % 3 == 0:
+            random_states = []
+            for _ in range(num_picks):
+                np.random.randint(2**31)
+                random_states.append(np.random.get_state())
+            for depth in (2, 3):
+                if (best_move_depth_picks(board, player, depth, random_states) !=
+                        best_move_depth_picks(legacy, player, depth, random_states)):
+                    mismatches.append(f"move {num_moves}: best_move_depth at depth {depth}")
+
+        move = choice(board.legal_moves())
+        board.update_board(player, move)
+        legacy.update_board(player, move)
+        if board.get_score() != legacy.get_score():
+            mismatches.append(f"move {num_moves}: score")
+        if not (board.data == legacy.data).all():
+            mismatches.append(f"move {num_moves}: board data")
+        player = 1 if player == 2 else 2
+        num_moves += 1
+    return mismatches
+
+
+if __name__ == "__main__":
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    seed(0)
+    np.random.seed(0)
+    sizes = [(7,8), (5,5), (10,12), (4,9)]
+    num_failed = 0
+    for game in range(num_games):
+        mismatches = check_game(Board(size=sizes[game % len(sizes)]).data)
+        if len(mismatches) > 0:
+            num_failed += 1
+            print(f"game {game}: " + ", ".join(mismatches))
+    print(f"{num_games - num_failed}/{num_games} games identical")
+    sys.exit(1 if num_failed > 0 else 0)
@@ -3,9 +3,17 @@ let sys = pyImport("sys")
 discard sys.path.append("..") # get module from above
 let board = pyImport("Board")
 let pickle = pyImport("pickle")
-let mcts = pyImport("MCTS")
+let searchSession = pyImport("SearchSession")
 var game = board.Board()
 var ai = "greedy"
+# The MCTS search runs in a background session between moves, so its tree is reused and it keeps
+# searching (pondering) while the player is thinking
+var aiSearch: PyObject
+var aiSearching = false
+proc stopSearch() =
+  if aiSearching:
+    discard aiSearch.close()
+    aiSearching = false
 proc renderRow(row: PyObject): auto =
   buildHTML(tdiv(class="flex")):
     for color in row:
@@ -72,20 +80,31 @@ routes:
   get "/move/@id":
     var id = parseInt(@"id")
     discard game.update_board(1, id)
+    # The AI only moves if the player's move didn't end the game
+    if game.over():
+      stopSearch()
+      redirect "/"
     var aiMove: int
     if ai == "greedy":
       aiMove = game.greedy_move(2).to(int)
     elif ai == "mcts":
       var time = now()
-      var mcts = mcts.MCTS(game, 2, exploration_parameter = 1, intelligence_parameter = 0.5)
-      aiMove = mcts.select_move(200).to(int)
+      if aiSearching:
+        discard aiSearch.opponent_moved(id)
+      else:
+        aiSearch = searchSession.SearchSession(game, 2, exploration_parameter = 1, intelligence_parameter = 0.5)
+        aiSearching = true
+      aiMove = aiSearch.best_move(time_limit = 2.0, max_iterations = 1000).to(int)
     discard game.update_board(2, aiMove)
+    if game.over():
+      stopSearch()
     redirect "/"
   get "/reset":
     var width = @"width".parseInt
     var height = @"height".parseInt
     ai = @"ai"
     game = board.Board(size=(height, width))
+    stopSearch()
     redirect "/"
   get "/download":
     attachment "game.save"
@@ -93,4 +112,5 @@ routes:
   post "/restore":
     var save = request.formData.getOrDefault("save").body
     game = pickle.loads(save)
+    stopSearch()
     redirect "/"